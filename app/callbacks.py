@@ -16,17 +16,44 @@ logger = logging.getLogger(__name__)
 class CallbackHandler:
     """Handles asynchronous callback delivery for status updates."""
 
-    def __init__(self, config: Config, storage: Storage, template_engine: TemplateEngine):
+    def __init__(
+        self,
+        config: Config,
+        storage: Storage,
+        template_engine: TemplateEngine,
+        http_client: httpx.AsyncClient | None = None,
+    ):
         """Initialize callback handler.
 
         Args:
             config: Server configuration
             storage: Storage instance
             template_engine: Template engine instance
+            http_client: Optional shared HTTP client; a short-lived client is
+                created per callback when omitted
         """
         self.config = config
         self.storage = storage
         self.template_engine = template_engine
+        self.http_client = http_client
+
+    @staticmethod
+    async def _post(client: httpx.AsyncClient, url: str, payload: dict[str, Any]) -> httpx.Response:
+        """POST a form-encoded callback payload.
+
+        Args:
+            client: HTTP client to send with
+            url: Callback URL
+            payload: Callback payload data
+
+        Returns:
+            HTTP response
+        """
+        return await client.post(
+            url,
+            data=payload,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
 
     async def send_callback(
         self,
@@ -48,29 +75,25 @@ class CallbackHandler:
         status_type = payload.get("MessageStatus") or payload.get("CallStatus", "unknown")
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    url,
-                    data=payload,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                )
-
-                logger.info(
-                    f"Callback sent to {url} for status '{status_type}' (attempt {attempt}): "
-                    f"HTTP {response.status_code}"
-                )
-
-                # Log callback attempt
-                self.storage.create_callback_log(
-                    target_url=url,
-                    payload=json.dumps(payload),
-                    status_code=response.status_code,
-                    response_body=response.text[:500],  # Limit response body size
-                    attempt_number=attempt,
-                )
-
-                # Consider 2xx status codes as success
-                return (200 <= response.status_code < 300), response.status_code, response.text
+            if self.http_client is not None:
+                response = await self._post(self.http_client, url, payload)
+            else:
+                async with httpx.AsyncClient(timeout=10.0) as client:
+                    response = await self._post(client, url, payload)
+
+            logger.info(
+                f"Callback sent to {url} for status '{status_type}' (attempt {attempt}): "
+                f"HTTP {response.status_code}"
+            )
+
+            # Log callback attempt
+            self.storage.create_callback_log(
+                target_url=url,
+                payload=json.dumps(payload),
+                status_code=response.status_code,
+                response_body=response.text[:500],  # Limit response body size
+                attempt_number=attempt,
+            )
 
         except Exception as e:
             logger.error(
@@ -88,6 +111,10 @@ class CallbackHandler:
 
             return False, 0, str(e)
 
+        else:
+            # Consider 2xx status codes as success
+            return (200 <= response.status_code < 300), response.status_code, response.text
+
     async def send_callback_with_retry(
         self,
         url: str,
@@ -102,8 +129,8 @@ class CallbackHandler:
         Returns:
             True if successful, False otherwise
         """
-        max_attempts = self.config.twilio.callbacks.retry_attempts
-        retry_delay = self.config.twilio.callbacks.retry_delay_seconds
+        max_attempts = self.config.twilio.callbacks_retry_attempts
+        retry_delay = self.config.twilio.callbacks_retry_delay_seconds
         status_type = payload.get("MessageStatus") or payload.get("CallStatus", "unknown")
 
         for attempt in range(1, max_attempts + 1):
@@ -155,7 +182,7 @@ class CallbackHandler:
             return
 
         # Initial delay before first status update
-        await asyncio.sleep(self.config.twilio.callbacks.delay_seconds)
+        await asyncio.sleep(self.config.twilio.callbacks_delay_seconds)
 
         account_sid = self.config.twilio.account_sid
 
@@ -197,7 +224,7 @@ class CallbackHandler:
 
             # Delay between status updates (except for last one)
             if status != statuses[-1]:
-                await asyncio.sleep(self.config.twilio.callbacks.delay_seconds)
+                await asyncio.sleep(self.config.twilio.callbacks_delay_seconds)
 
         logger.info(f"Message callbacks completed for {message_sid} (final status: {statuses[-1]})")
 
@@ -233,7 +260,7 @@ class CallbackHandler:
             return
 
         # Initial delay before first status update
-        await asyncio.sleep(self.config.twilio.callbacks.delay_seconds)
+        await asyncio.sleep(self.config.twilio.callbacks_delay_seconds)
 
         account_sid = self.config.twilio.account_sid
 
@@ -276,6 +303,6 @@ class CallbackHandler:
 
             # Delay between status updates (except for last one)
             if status != statuses[-1]:
-                await asyncio.sleep(self.config.twilio.callbacks.delay_seconds)
+                await asyncio.sleep(self.config.twilio.callbacks_delay_seconds)
 
         logger.info(f"Call callbacks completed for {call_sid} (final status: {statuses[-1]})")
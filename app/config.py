@@ -1,97 +1,226 @@
 """Configuration loader and validator for SMS Mock Server."""
 import os
+from dataclasses import dataclass, field, fields
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Self
 
 import yaml
 
+# libyaml-backed safe loader when available; the pure-Python one otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Unset or sample-config credentials (None covers keys left empty in YAML)
+_PLACEHOLDER_SIDS: frozenset[str | None] = frozenset(
+    {None, "", "ACXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX"}
+)
+_PLACEHOLDER_TOKENS: frozenset[str | None] = frozenset({None, "", "your_auth_token_here"})
+
 
 class ConfigurationError(Exception):
     """Raised when configuration is invalid."""
     pass
 
 
-class ServerConfig:
-    """Server configuration."""
+def _read_config_file(config_path: Path) -> bytes:
+    """Read a config file with one open, fstat and read.
 
-    def __init__(self, data: dict[str, Any]):
-        self.host: str = data.get("host", "0.0.0.0")
-        self.port: int = data.get("port", 8080)
-        self.timezone: str = data.get("timezone", "UTC")
+    Args:
+        config_path: Path to the config file
 
+    Returns:
+        Raw file contents
 
-class ValidationConfig:
-    """Validation settings configuration."""
+    Raises:
+        ConfigurationError: If the file is missing or empty
+    """
+    try:
+        fd = os.open(config_path, os.O_RDONLY)
+    except FileNotFoundError:
+        raise ConfigurationError(f"Config file not found: {config_path}") from None
+
+    try:
+        size = os.fstat(fd).st_size
+        if size == 0:
+            raise ConfigurationError("Config file is empty")
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
 
-    def __init__(self, data: dict[str, Any]):
-        self.require_auth: bool = data.get("require_auth", True)
-        self.validate_phone_format: bool = data.get("validate_phone_format", True)
-        self.check_from_numbers: bool = data.get("check_from_numbers", True)
-        self.require_parameters: bool = data.get("require_parameters", True)
 
+@lru_cache(maxsize=32)
+def _parse_yaml(buffer: bytes) -> Any:
+    """Parse a YAML document, memoized on its contents.
 
-class CallbackConfig:
-    """Callback settings configuration."""
+    The returned data is shared between calls and must not be mutated.
 
-    def __init__(self, data: dict[str, Any]):
-        self.enabled: bool = data.get("enabled", True)
-        self.delay_seconds: int = data.get("delay_seconds", 2)
-        self.retry_attempts: int = data.get("retry_attempts", 3)
-        self.retry_delay_seconds: int = data.get("retry_delay_seconds", 5)
+    Args:
+        buffer: Raw YAML bytes
 
+    Returns:
+        Parsed YAML document
+    """
+    return yaml.load(buffer, Loader=_YAML_LOADER)  # noqa: S506 - a SafeLoader variant
 
-class TwilioConfig:
-    """Twilio provider configuration."""
 
-    def __init__(self, data: dict[str, Any]):
-        self.account_sid: str = data.get("account_sid", "")
-        self.auth_token: str = data.get("auth_token", "")
+@cache
+def _section_schema(cls: type) -> tuple[tuple[str, str | None, str, tuple[Any, ...]], ...]:
+    """Describe how a section dataclass is read from a config dict.
 
-        # Validation settings
-        validation_data = data.get("validation", {})
-        self.validation = ValidationConfig(validation_data)
+    Args:
+        cls: Section dataclass
 
-        # Number behavior
-        self.default_behavior: str = data.get("default_behavior", "success")
-        if self.default_behavior not in ["success", "failure"]:
-            raise ConfigurationError(
-                f"default_behavior must be 'success' or 'failure', got: {self.default_behavior}"
-            )
+    Returns:
+        One (name, subsection, key, choices) entry per field
+    """
+    return tuple(
+        (
+            f.name,
+            f.metadata.get("section"),
+            f.metadata.get("key", f.name),
+            tuple(f.metadata.get("choices", ())),
+        )
+        for f in fields(cls)
+    )
+
+
+class _Section:
+    """Base for config sections built from a dict in a single pass."""
 
-        # Number lists
-        self.registered_numbers: list[str] = data.get("registered_numbers", [])
-        self.allowed_from_numbers: list[str] = data.get("allowed_from_numbers", [])
-        self.failure_numbers: list[str] = data.get("failure_numbers", [])
+    __slots__ = ()
 
-        # Callbacks
-        callback_data = data.get("callbacks", {})
-        self.callbacks = CallbackConfig(callback_data)
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        """Build from a config section, using field defaults for missing keys.
+
+        Flat fields whose metadata names a "section" are read from that
+        nested section, and fields declaring "choices" metadata are checked
+        against them.
+
+        Args:
+            data: Config section
+
+        Returns:
+            Section instance
+
+        Raises:
+            ConfigurationError: If a value is not one of its field's choices
+        """
+        values = {}
+        for name, subsection, key, choices in _section_schema(cls):
+            source = data.get(subsection, {}) if subsection else data
+            if key not in source:
+                continue
+            value = source[key]
+            if choices and value not in choices:
+                allowed = " or ".join(repr(choice) for choice in choices)
+                raise ConfigurationError(f"{key} must be {allowed}, got: {value}")
+            values[name] = value
+        return cls(**values)
+
+
+@dataclass(frozen=True, slots=True)
+class ServerConfig(_Section):
+    """Server configuration."""
+
+    host: str = "0.0.0.0"
+    port: int = 8080
+    timezone: str = "UTC"
+
+
+@dataclass(frozen=True, slots=True)
+class ValidationConfig(_Section):
+    """Validation settings configuration."""
+
+    require_auth: bool = True
+    validate_phone_format: bool = True
+    check_from_numbers: bool = True
+    require_parameters: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class CallbackConfig(_Section):
+    """Callback settings configuration."""
+
+    enabled: bool = True
+    delay_seconds: int = 2
+    retry_attempts: int = 3
+    retry_delay_seconds: int = 5
+
+
+@dataclass(frozen=True, slots=True)
+class TwilioConfig(_Section):
+    """Twilio provider configuration."""
+
+    account_sid: str = ""
+    auth_token: str = ""
+
+    # Validation settings, flattened from the "validation" section
+    validation_require_auth: bool = field(
+        default=True, metadata={"section": "validation", "key": "require_auth"}
+    )
+    validation_validate_phone_format: bool = field(
+        default=True, metadata={"section": "validation", "key": "validate_phone_format"}
+    )
+    validation_check_from_numbers: bool = field(
+        default=True, metadata={"section": "validation", "key": "check_from_numbers"}
+    )
+    validation_require_parameters: bool = field(
+        default=True, metadata={"section": "validation", "key": "require_parameters"}
+    )
+
+    # Number behavior
+    default_behavior: str = field(default="success", metadata={"choices": ("success", "failure")})
+
+    # Number lists, frozen to sets for constant-time membership checks
+    registered_numbers: frozenset[str] = frozenset()
+    allowed_from_numbers: frozenset[str] = frozenset()
+    failure_numbers: frozenset[str] = frozenset()
+
+    # Callbacks, flattened from the "callbacks" section
+    callbacks_enabled: bool = field(
+        default=True, metadata={"section": "callbacks", "key": "enabled"}
+    )
+    callbacks_delay_seconds: int = field(
+        default=2, metadata={"section": "callbacks", "key": "delay_seconds"}
+    )
+    callbacks_retry_attempts: int = field(
+        default=3, metadata={"section": "callbacks", "key": "retry_attempts"}
+    )
+    callbacks_retry_delay_seconds: int = field(
+        default=5, metadata={"section": "callbacks", "key": "retry_delay_seconds"}
+    )
+
+    def __post_init__(self) -> None:
+        """Freeze the number lists read from YAML into sets."""
+        for name in ("registered_numbers", "allowed_from_numbers", "failure_numbers"):
+            object.__setattr__(self, name, frozenset(getattr(self, name)))
 
     def validate(self) -> None:
         """Validate Twilio configuration."""
-        if self.validation.require_auth:
-            if not self.account_sid or self.account_sid == "ACXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX":
+        if self.validation_require_auth:
+            if self.account_sid in _PLACEHOLDER_SIDS:
                 raise ConfigurationError(
                     "Twilio account_sid must be set when require_auth is enabled"
                 )
-            if not self.auth_token or self.auth_token == "your_auth_token_here":
+            if self.auth_token in _PLACEHOLDER_TOKENS:
                 raise ConfigurationError(
                     "Twilio auth_token must be set when require_auth is enabled"
                 )
 
 
-class DatabaseConfig:
+@dataclass(frozen=True, slots=True)
+class DatabaseConfig(_Section):
     """Database configuration."""
 
-    def __init__(self, data: dict[str, Any]):
-        self.path: str = data.get("path", "./data/mock_server.db")
+    path: str = "./data/mock_server.db"
 
 
-class TemplatesConfig:
+@dataclass(frozen=True, slots=True)
+class TemplatesConfig(_Section):
     """Templates configuration."""
 
-    def __init__(self, data: dict[str, Any]):
-        self.path: str = data.get("path", "./templates/responses")
+    path: str = "./templates/responses"
 
 
 class Config:
@@ -107,19 +236,15 @@ class Config:
             config_path = os.getenv("CONFIG_PATH", "./config.yaml")
 
         self.config_path = Path(config_path)
-        if not self.config_path.exists():
-            raise ConfigurationError(f"Config file not found: {config_path}")
-
-        with open(self.config_path, "r") as f:
-            data = yaml.safe_load(f)
+        data = _parse_yaml(_read_config_file(self.config_path))
 
         if not data:
             raise ConfigurationError("Config file is empty")
 
         # Load sections
-        self.server = ServerConfig(data.get("server", {}))
-        self.database = DatabaseConfig(data.get("database", {}))
-        self.templates = TemplatesConfig(data.get("templates", {}))
+        self.server = ServerConfig.from_dict(data.get("server", {}))
+        self.database = DatabaseConfig.from_dict(data.get("database", {}))
+        self.templates = TemplatesConfig.from_dict(data.get("templates", {}))
 
         # Provider
         self.provider: str = data.get("provider", "twilio")
@@ -133,7 +258,7 @@ class Config:
         if not twilio_data:
             raise ConfigurationError("Twilio configuration section is missing")
 
-        self.twilio = TwilioConfig(twilio_data)
+        self.twilio = TwilioConfig.from_dict(twilio_data)
 
         # Validate configuration
         self.validate()
@@ -142,9 +267,12 @@ class Config:
         """Validate entire configuration."""
         self.twilio.validate()
 
-        # Ensure database directory exists
-        db_path = Path(self.database.path)
-        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Ensure database directory exists; a single stat covers the usual case
+        db_dir = Path(self.database.path).parent
+        try:
+            db_dir.stat()
+        except FileNotFoundError:
+            db_dir.mkdir(parents=True, exist_ok=True)
 
         # Ensure templates directory exists
         templates_path = Path(self.templates.path)
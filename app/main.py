@@ -1,6 +1,8 @@
 """Main FastAPI application for SMS Mock Server."""
 import base64
+import binascii
 import logging
+from dataclasses import asdict
 from datetime import datetime, timezone
 
 from fastapi import FastAPI, Request, BackgroundTasks
@@ -10,6 +12,7 @@ from fastapi.staticfiles import StaticFiles
 from app.config import load_config
 from app.storage import Storage
 from app.template_engine import TemplateEngine
+from app.providers.base import ValidationError
 from app.providers.twilio import TwilioProvider
 from app.callbacks import CallbackHandler
 from app.ui import setup_ui_routes
@@ -65,11 +68,16 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 setup_ui_routes(app, storage, config)
 
 
-def extract_basic_auth(authorization: str | None) -> tuple[str | None, str | None]:
+_BASIC_PREFIX = "Basic "
+_BASIC_PREFIX_BYTES = _BASIC_PREFIX.encode("ascii")
+_BASIC_PREFIX_LEN = len(_BASIC_PREFIX)
+
+
+def extract_basic_auth(authorization: bytes | str | None) -> tuple[str | None, str | None]:
     """Extract username and password from Basic Auth header.
 
     Args:
-        authorization: Authorization header value
+        authorization: Authorization header value, as text or raw ASGI bytes
 
     Returns:
         Tuple of (username, password) or (None, None)
@@ -77,15 +85,45 @@ def extract_basic_auth(authorization: str | None) -> tuple[str | None, str | Non
     if not authorization:
         return None, None
 
-    if not authorization.startswith("Basic "):
+    # Bytes headers are compared as bytes; only the decoded credentials become text
+    prefix = _BASIC_PREFIX_BYTES if isinstance(authorization, bytes) else _BASIC_PREFIX
+    if authorization[:_BASIC_PREFIX_LEN] != prefix:
+        return None, None
+
+    try:
+        # validate=True rejects non-alphabet characters instead of skipping them,
+        # so surrounding whitespace is stripped first
+        raw = base64.b64decode(authorization[_BASIC_PREFIX_LEN:].strip(), validate=True)
+    except (binascii.Error, ValueError):
+        return None, None
+
+    username, sep, password = raw.partition(b":")
+    if not sep:
         return None, None
 
     try:
-        credentials = base64.b64decode(authorization[6:]).decode("utf-8")
-        username, password = credentials.split(":", 1)
-        return username, password
-    except (ValueError, UnicodeDecodeError):
+        credentials = username.decode("utf-8"), password.decode("utf-8")
+    except UnicodeDecodeError:
         return None, None
+    return credentials
+
+
+def _error_response(error: ValidationError) -> JSONResponse:
+    """Render a validation error with its provider error template.
+
+    Args:
+        error: Failed validation details
+
+    Returns:
+        JSONResponse with the error's HTTP status
+    """
+    return JSONResponse(
+        status_code=error.http_status,
+        content=template_engine.render_error(
+            provider.get_error_template(error.error_type),
+            asdict(error),
+        ),
+    )
 
 
 def validate_request(
@@ -108,47 +146,23 @@ def validate_request(
     # Validate authentication
     is_valid, error = provider.validate_auth(username, password)
     if not is_valid:
-        return JSONResponse(
-            status_code=error["http_status"],
-            content=template_engine.render_error(
-                provider.get_error_template(error["error_type"]),
-                error,
-            ),
-        )
+        return _error_response(error)
 
     # Validate required parameters
     is_valid, error = provider.validate_parameters(request_data, required_params)
     if not is_valid:
-        return JSONResponse(
-            status_code=error["http_status"],
-            content=template_engine.render_error(
-                provider.get_error_template(error["error_type"]),
-                error,
-            ),
-        )
+        return _error_response(error)
 
     # Validate phone number formats
     for field in ["From", "To"]:
         is_valid, error = provider.validate_phone_number(request_data[field], field)
         if not is_valid:
-            return JSONResponse(
-                status_code=error["http_status"],
-                content=template_engine.render_error(
-                    provider.get_error_template(error["error_type"]),
-                    error,
-                ),
-            )
+            return _error_response(error)
 
     # Validate From number is in allowed list
     is_valid, error = provider.validate_from_number(request_data["From"])
     if not is_valid:
-        return JSONResponse(
-            status_code=error["http_status"],
-            content=template_engine.render_error(
-                provider.get_error_template(error["error_type"]),
-                error,
-            ),
-        )
+        return _error_response(error)
 
     return None
 
@@ -318,7 +332,7 @@ async def send_message(
         message_sid=message_sid,
         from_number=request_data["From"],
         to_number=request_data["To"],
-        callback_url=callback_url if (callback_url and config.twilio.callbacks.enabled) else None,
+        callback_url=callback_url if (callback_url and config.twilio.callbacks_enabled) else None,
         will_succeed=will_succeed,
     )
 
@@ -396,7 +410,7 @@ async def make_call(
         call_sid=call_sid,
         from_number=request_data["From"],
         to_number=request_data["To"],
-        callback_url=callback_url if (callback_url and config.twilio.callbacks.enabled) else None,
+        callback_url=callback_url if (callback_url and config.twilio.callbacks_enabled) else None,
         will_succeed=will_succeed,
     )
 
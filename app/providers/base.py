@@ -1,8 +1,34 @@
 """Base provider interface for SMS Mock Server."""
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import StrEnum
 from typing import Any
 
 
+class ErrorType(StrEnum):
+    """Validation error types, each naming its error template."""
+
+    AUTH_FAILED = "auth_failed"
+    MISSING_PARAMETER = "missing_parameter"
+    INVALID_PHONE_NUMBER = "invalid_phone_number"
+    INVALID_FROM_NUMBER = "invalid_from_number"
+
+
+@dataclass(frozen=True, slots=True)
+class ValidationError:
+    """Details of a failed request validation.
+
+    The fields double as the context for the matching error template.
+    """
+
+    error_type: ErrorType
+    http_status: int
+    parameter: str | None = None
+    field: str | None = None
+    number: str | None = None
+    from_number: str | None = None
+
+
 class BaseProvider(ABC):
     """Abstract base class for provider implementations."""
 
@@ -33,7 +59,7 @@ class BaseProvider(ABC):
     @abstractmethod
     def validate_auth(
         self, username: str | None, password: str | None
-    ) -> tuple[bool, dict[str, Any] | None]:
+    ) -> tuple[bool, ValidationError | None]:
         """Validate authentication credentials.
 
         Args:
@@ -50,7 +76,7 @@ class BaseProvider(ABC):
     @abstractmethod
     def validate_parameters(
         self, request_data: dict[str, Any], required_params: list
-    ) -> tuple[bool, dict[str, Any] | None]:
+    ) -> tuple[bool, ValidationError | None]:
         """Validate required parameters are present.
 
         Args:
@@ -65,7 +91,7 @@ class BaseProvider(ABC):
     @abstractmethod
     def validate_phone_number(
         self, number: str, field_name: str
-    ) -> tuple[bool, dict[str, Any] | None]:
+    ) -> tuple[bool, ValidationError | None]:
         """Validate phone number format (E.164).
 
         Args:
@@ -80,7 +106,7 @@ class BaseProvider(ABC):
     @abstractmethod
     def validate_from_number(
         self, number: str
-    ) -> tuple[bool, dict[str, Any] | None]:
+    ) -> tuple[bool, ValidationError | None]:
         """Validate From number is in allowed list.
 
         Args:
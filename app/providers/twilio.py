@@ -1,10 +1,29 @@
 """Twilio provider implementation for SMS Mock Server."""
+from functools import lru_cache
 from typing import Any, override
 
 import phonenumbers
 
 from app.config import TwilioConfig
-from app.providers.base import BaseProvider
+from app.providers.base import BaseProvider, ErrorType, ValidationError
+
+
+# Clients of a mock server resend the same few test numbers, so most checks hit.
+# The bound caps memory for a stream of distinct numbers, which only evicts.
+@lru_cache(maxsize=1024)
+def _is_valid_number(number: str) -> bool:
+    """Check whether a number parses as a valid international phone number.
+
+    Args:
+        number: Phone number to check
+
+    Returns:
+        True if phonenumbers accepts the number, False otherwise
+    """
+    try:
+        return phonenumbers.is_valid_number(phonenumbers.parse(number, None))
+    except phonenumbers.NumberParseException:
+        return False
 
 
 class TwilioProvider(BaseProvider):
@@ -33,7 +52,7 @@ class TwilioProvider(BaseProvider):
     @override
     def validate_auth(
         self, username: str | None, password: str | None
-    ) -> tuple[bool, dict[str, Any] | None]:
+    ) -> tuple[bool, ValidationError | None]:
         """Validate authentication credentials.
 
         Args:
@@ -43,27 +62,21 @@ class TwilioProvider(BaseProvider):
         Returns:
             Tuple of (is_valid, error_response)
         """
-        if not self.config.validation.require_auth:
+        if not self.config.validation_require_auth:
             return True, None
 
         if not username or not password:
-            return False, {
-                "error_type": "auth_failed",
-                "http_status": 401,
-            }
+            return False, ValidationError(error_type=ErrorType.AUTH_FAILED, http_status=401)
 
         if username != self.config.account_sid or password != self.config.auth_token:
-            return False, {
-                "error_type": "auth_failed",
-                "http_status": 401,
-            }
+            return False, ValidationError(error_type=ErrorType.AUTH_FAILED, http_status=401)
 
         return True, None
 
     @override
     def validate_parameters(
         self, request_data: dict[str, Any], required_params: list
-    ) -> tuple[bool, dict[str, Any] | None]:
+    ) -> tuple[bool, ValidationError | None]:
         """Validate required parameters are present.
 
         Args:
@@ -73,23 +86,23 @@ class TwilioProvider(BaseProvider):
         Returns:
             Tuple of (is_valid, error_response)
         """
-        if not self.config.validation.require_parameters:
+        if not self.config.validation_require_parameters:
             return True, None
 
         for param in required_params:
             if param not in request_data or not request_data[param]:
-                return False, {
-                    "error_type": "missing_parameter",
-                    "http_status": 400,
-                    "parameter": param,
-                }
+                return False, ValidationError(
+                    error_type=ErrorType.MISSING_PARAMETER,
+                    http_status=400,
+                    parameter=param,
+                )
 
         return True, None
 
     @override
     def validate_phone_number(
         self, number: str, field_name: str
-    ) -> tuple[bool, dict[str, Any] | None]:
+    ) -> tuple[bool, ValidationError | None]:
         """Validate phone number format (E.164).
 
         Args:
@@ -99,32 +112,23 @@ class TwilioProvider(BaseProvider):
         Returns:
             Tuple of (is_valid, error_response)
         """
-        if not self.config.validation.validate_phone_format:
+        if not self.config.validation_validate_phone_format:
             return True, None
 
-        try:
-            parsed = phonenumbers.parse(number, None)
-            if not phonenumbers.is_valid_number(parsed):
-                return False, {
-                    "error_type": "invalid_phone_number",
-                    "http_status": 400,
-                    "field": field_name,
-                    "number": number,
-                }
-        except phonenumbers.NumberParseException:
-            return False, {
-                "error_type": "invalid_phone_number",
-                "http_status": 400,
-                "field": field_name,
-                "number": number,
-            }
+        if not _is_valid_number(number):
+            return False, ValidationError(
+                error_type=ErrorType.INVALID_PHONE_NUMBER,
+                http_status=400,
+                field=field_name,
+                number=number,
+            )
 
         return True, None
 
     @override
     def validate_from_number(
         self, number: str
-    ) -> tuple[bool, dict[str, Any] | None]:
+    ) -> tuple[bool, ValidationError | None]:
         """Validate From number is in allowed list.
 
         Args:
@@ -133,15 +137,15 @@ class TwilioProvider(BaseProvider):
         Returns:
             Tuple of (is_valid, error_response)
         """
-        if not self.config.validation.check_from_numbers:
+        if not self.config.validation_check_from_numbers:
             return True, None
 
         if number not in self.config.allowed_from_numbers:
-            return False, {
-                "error_type": "invalid_from_number",
-                "http_status": 400,
-                "from_number": number,
-            }
+            return False, ValidationError(
+                error_type=ErrorType.INVALID_FROM_NUMBER,
+                http_status=400,
+                from_number=number,
+            )
 
         return True, None
 
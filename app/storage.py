@@ -1,6 +1,7 @@
 """Database storage layer for SMS Mock Server."""
 import sqlite3
-from collections.abc import Generator
+import threading
+from collections.abc import Callable, Generator
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
@@ -13,21 +14,74 @@ class Storage:
         """Initialize storage with database path.
 
         Args:
-            db_path: Path to SQLite database file
+            db_path: Path to SQLite database file, or ":memory:" for a
+                private in-memory database
         """
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # An in-memory database lives only as long as its connection, so keep one open
+        self._memory_conn: sqlite3.Connection | None = None
+        # UI reads run in worker threads, so use of that one connection is serialized
+        self._memory_lock = threading.RLock()
+        if db_path == ":memory:":
+            self._memory_conn = self._connect()
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_listeners: list[Callable[[], None]] = []
         self._init_database()
 
+    def add_write_listener(self, listener: Callable[[], None]) -> None:
+        """Register a callback invoked after every committed write.
+
+        Registering a listener that is already registered is a no-op.
+
+        Args:
+            listener: Callable taking no arguments
+        """
+        if listener not in self._write_listeners:
+            self._write_listeners.append(listener)
+
+    def _notify_write(self) -> None:
+        """Notify registered listeners that data has changed."""
+        for listener in self._write_listeners:
+            listener()
+
+    def close(self) -> None:
+        """Close the long-lived connection of an in-memory database.
+
+        File databases open a connection per call, so this is a no-op for them.
+        """
+        if self._memory_conn is not None:
+            with self._memory_lock:
+                self._memory_conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection to the database.
+
+        Returns:
+            SQLite connection with row factory configured
+        """
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # Safe under WAL: commits skip the fsync, only checkpoints sync
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
     @contextmanager
     def _get_connection(self) -> Generator[sqlite3.Connection]:
         """Get database connection with automatic cleanup.
 
+        In-memory databases reuse their single long-lived connection, held
+        under a lock for the whole block so threads never interleave on it.
+
         Yields:
             SQLite connection with row factory configured
         """
-        conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
+        if self._memory_conn is not None:
+            with self._memory_lock:
+                yield self._memory_conn
+            return
+
+        conn = self._connect()
         try:
             yield conn
         finally:
@@ -139,6 +193,7 @@ class Storage:
             )
             message_id = cursor.lastrowid
             conn.commit()
+            self._notify_write()
             return message_id
 
     def get_message(self, message_sid: str) -> dict[str, Any] | None:
@@ -174,6 +229,7 @@ class Storage:
                 (status, message_sid),
             )
             conn.commit()
+            self._notify_write()
 
     def get_all_messages(self, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
         """Get all messages with pagination.
@@ -230,6 +286,7 @@ class Storage:
             )
             call_id = cursor.lastrowid
             conn.commit()
+            self._notify_write()
             return call_id
 
     def get_call(self, call_sid: str) -> dict[str, Any] | None:
@@ -265,6 +322,7 @@ class Storage:
                 (status, call_sid),
             )
             conn.commit()
+            self._notify_write()
 
     def get_all_calls(self, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
         """Get all calls with pagination.
@@ -315,6 +373,7 @@ class Storage:
             )
             event_id = cursor.lastrowid
             conn.commit()
+            self._notify_write()
             return event_id
 
     def update_delivery_event_callback(
@@ -338,6 +397,7 @@ class Storage:
                 (callback_sent, callback_response, event_id),
             )
             conn.commit()
+            self._notify_write()
 
     # Callback log operations
     def create_callback_log(
@@ -371,6 +431,7 @@ class Storage:
             )
             log_id = cursor.lastrowid
             conn.commit()
+            self._notify_write()
             return log_id
 
     def get_all_callback_logs(self, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
@@ -456,6 +517,7 @@ class Storage:
             cursor.execute("DELETE FROM messages")
 
             conn.commit()
+            self._notify_write()
             return count
 
     def clear_calls(self) -> int:
@@ -478,6 +540,7 @@ class Storage:
             cursor.execute("DELETE FROM calls")
 
             conn.commit()
+            self._notify_write()
             return count
 
     def clear_callbacks(self) -> int:
@@ -497,6 +560,7 @@ class Storage:
             cursor.execute("DELETE FROM callback_logs")
 
             conn.commit()
+            self._notify_write()
             return count
 
     def clear_all(self) -> dict[str, int]:
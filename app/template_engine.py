@@ -1,38 +1,72 @@
 """Template engine for rendering JSON responses."""
 import json
+import os
 import secrets
 import string
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import (
+    BaseLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    select_autoescape,
+)
 
 
 class TemplateEngine:
     """Jinja2-based template engine for JSON responses."""
 
-    def __init__(self, templates_path: str, provider: str = "twilio"):
+    def __init__(
+        self,
+        templates_path: str,
+        provider: str = "twilio",
+        loader: BaseLoader | None = None,
+        auto_reload: bool = True,
+        bytecode_cache_dir: str | None = None,
+    ):
         """Initialize template engine.
 
         Args:
             templates_path: Path to templates directory
             provider: Provider name (e.g., 'twilio')
+            loader: Optional Jinja2 loader serving both response and error
+                templates (e.g. a DictLoader); templates_path is then unused
+            auto_reload: Re-check template files for changes on every render.
+                Disable when templates cannot change while the engine runs.
+            bytecode_cache_dir: Directory for compiled template bytecode.
+                Defaults to the JINJA_BYTECODE_CACHE env var; unset disables it.
         """
         self.templates_path = Path(templates_path)
         self.provider = provider
+        self.auto_reload = auto_reload
+        self._compiled: dict[str, Template] = {}
+
+        if bytecode_cache_dir is None:
+            bytecode_cache_dir = os.getenv("JINJA_BYTECODE_CACHE")
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
 
         # Set up Jinja2 environment for response templates
         self.response_env = Environment(
-            loader=FileSystemLoader(str(self.templates_path)),
+            loader=loader or FileSystemLoader(str(self.templates_path)),
             autoescape=select_autoescape(disabled_extensions=("json",)),
+            auto_reload=auto_reload,
+            bytecode_cache=bytecode_cache,
         )
 
         # Set up Jinja2 environment for error templates
         errors_path = self.templates_path.parent / "errors"
         self.error_env = Environment(
-            loader=FileSystemLoader(str(errors_path)),
+            loader=loader or FileSystemLoader(str(errors_path)),
             autoescape=select_autoescape(disabled_extensions=("json",)),
+            auto_reload=auto_reload,
+            bytecode_cache=bytecode_cache,
         )
 
     def generate_sid(self, prefix: str = "SM") -> str:
@@ -82,28 +116,18 @@ class TemplateEngine:
         Returns:
             Number of segments required
         """
-        if not body:
-            return 1
-
-        # Check if message contains non-GSM characters (simple check for non-ASCII)
-        is_unicode = any(ord(char) > 127 for char in body)
+        message_length = len(body)
 
-        # Define segment limits
-        if is_unicode:
-            single_limit = 70
-            multi_limit = 67
+        # Non-ASCII text needs UCS-2; isascii() is a single C-level scan
+        if body.isascii():
+            single_limit, multi_limit = 160, 153
         else:
-            single_limit = 160
-            multi_limit = 153
+            single_limit, multi_limit = 70, 67
 
-        message_length = len(body)
-
-        # Calculate segments
         if message_length <= single_limit:
             return 1
-        else:
-            # For multi-part messages, each segment uses the multi_limit
-            return (message_length + multi_limit - 1) // multi_limit  # Ceiling division
+        # For multi-part messages, each segment uses the multi_limit
+        return (message_length + multi_limit - 1) // multi_limit  # Ceiling division
 
     def render_response(
         self,
@@ -125,13 +149,31 @@ class TemplateEngine:
         context.setdefault("timestamp", self.get_iso_timestamp())
 
         # Load and render template
-        template_path = f"{self.provider}/{template_name}"
-        template = self.response_env.get_template(template_path)
-        rendered = template.render(**context)
+        rendered = self.get_compiled(template_name).render(**context)
 
         # Parse JSON and return as dict
         return json.loads(rendered)
 
+    def get_compiled(self, template_name: str) -> Template:
+        """Get the compiled response template for the current provider.
+
+        With auto_reload disabled the Template is memoized on first use, so
+        later calls skip Jinja's loader lookup entirely. With auto_reload
+        enabled every call goes through Jinja so edited files are picked up.
+
+        Args:
+            template_name: Template filename
+
+        Returns:
+            Compiled Jinja2 template
+        """
+        template = self._compiled.get(template_name)
+        if template is None:
+            template = self.response_env.get_template(f"{self.provider}/{template_name}")
+            if not self.auto_reload:
+                self._compiled[template_name] = template
+        return template
+
     def render_error(
         self,
         template_name: str,
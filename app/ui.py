@@ -1,7 +1,12 @@
 """Web UI routes for SMS Mock Server."""
+
+import asyncio
+import functools
 import json
 import logging
 import math
+import time
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -19,6 +24,9 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter()
 
+# SQLite CURRENT_TIMESTAMP values are stored in UTC
+_UTC = ZoneInfo("UTC")
+
 # Setup Jinja2 for HTML templates
 templates = Jinja2Templates(directory="templates/ui")
 
@@ -44,9 +52,105 @@ def asset_url(path: str) -> str:
     """
     return _asset_manifest.get(path, path)
 
+
 # Pagination constant
 ITEMS_PER_PAGE = 50
 
+# Rendered list pages are reused for a few seconds unless data changes
+HTML_CACHE_TTL_SECONDS = 5
+HTML_CACHE_MAX_ENTRIES = 512
+
+
+class HtmlCache:
+    """Short-lived cache of rendered HTML pages keyed by (path, page).
+
+    Entries expire after a TTL and the whole cache is dropped on every
+    storage write, so HTMX polls of unchanged pages skip the database
+    queries and template rendering.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        """Initialize the cache.
+
+        Args:
+            ttl_seconds: Lifetime of a cached page
+            max_entries: Maximum number of cached pages
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries: dict[tuple[str, int], tuple[float, bytes]] = {}
+
+    def get(self, key: tuple[str, int]) -> bytes | None:
+        """Get a cached page body.
+
+        Args:
+            key: Cache key (path, page)
+
+        Returns:
+            Cached body, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, body = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        return body
+
+    def put(self, key: tuple[str, int], body: bytes, generation: int) -> None:
+        """Store a rendered page body.
+
+        The body is dropped if the cache was cleared while it was being
+        rendered, so a page read before a write is never served after it.
+
+        Args:
+            key: Cache key (path, page)
+            body: Rendered page body
+            generation: Cache generation observed before rendering
+        """
+        if generation != self.generation:
+            return
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, bytes(body))
+
+    def clear(self) -> None:
+        """Drop all cached pages."""
+        self.generation += 1
+        self._entries.clear()
+
+
+html_cache = HtmlCache(HTML_CACHE_TTL_SECONDS, HTML_CACHE_MAX_ENTRIES)
+
+PageHandler = Callable[[Request, int], Awaitable[HTMLResponse]]
+
+
+def cached_page(handler: PageHandler) -> PageHandler:
+    """Serve a paged route from html_cache, rendering and storing on a miss.
+
+    Args:
+        handler: Route handler taking (request, page)
+
+    Returns:
+        Wrapped handler with the same signature
+    """
+
+    @functools.wraps(handler)
+    async def wrapper(request: Request, page: int = 1) -> HTMLResponse:
+        cache_key = (request.url.path, page)
+        cached = html_cache.get(cache_key)
+        if cached is not None:
+            return HTMLResponse(content=cached)
+        # Read before rendering so a write landing mid-render voids the put
+        generation = html_cache.generation
+        response = await handler(request, page)
+        html_cache.put(cache_key, response.body, generation)
+        return response
+
+    return wrapper
+
 
 def calculate_total_pages(total_items: int) -> int:
     """Calculate total pages for pagination.
@@ -95,6 +199,23 @@ def parse_callback_payloads(callbacks: list[dict[str, Any]]) -> None:
         parse_callback_payload(callback)
 
 
+async def _in_thread(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking call in the default thread pool.
+
+    Keeps SQLite I/O off the event loop so concurrent HTMX polls
+    don't serialize behind each other.
+
+    Args:
+        fn: Blocking callable
+        *args: Positional arguments for fn
+        **kwargs: Keyword arguments for fn
+
+    Returns:
+        Return value of fn
+    """
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
+
 def setup_ui_routes(app, storage: Storage, config: Config):
     """Setup UI routes on the FastAPI app.
 
@@ -109,7 +230,7 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         target_tz = ZoneInfo(tz_name)
     except Exception:
         logger.warning(f"Invalid timezone '{tz_name}', falling back to UTC")
-        target_tz = ZoneInfo("UTC")
+        target_tz = _UTC
         tz_name = "UTC"
 
     def format_datetime(value):
@@ -124,14 +245,10 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         if not value:
             return ""
         try:
-            # Parse SQLite timestamp (format: YYYY-MM-DD HH:MM:SS)
-            dt = datetime.strptime(str(value), "%Y-%m-%d %H:%M:%S")
-            # Assume it's UTC
-            dt_utc = dt.replace(tzinfo=ZoneInfo("UTC"))
-            # Convert to target timezone
-            dt_local = dt_utc.astimezone(target_tz)
-            # Format for display
-            return dt_local.strftime("%Y-%m-%d %H:%M:%S")
+            # Parse SQLite timestamp (format: YYYY-MM-DD HH:MM:SS) as UTC
+            dt_utc = datetime.fromisoformat(str(value)).replace(tzinfo=_UTC)
+            # Convert to target timezone and format for display
+            return dt_utc.astimezone(target_tz).strftime("%Y-%m-%d %H:%M:%S")
         except (ValueError, TypeError) as e:
             logger.debug(f"Failed to parse datetime '{value}': {e}")
             return str(value)
@@ -142,6 +259,9 @@ def setup_ui_routes(app, storage: Storage, config: Config):
     templates.env.globals["timezone"] = tz_name
     templates.env.globals["asset_url"] = asset_url
 
+    # Drop cached pages whenever data changes
+    storage.add_write_listener(html_cache.clear)
+
     @app.get("/", response_class=HTMLResponse)
     async def dashboard(request: Request):
         """Dashboard showing overview and statistics.
@@ -152,9 +272,9 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         Returns:
             HTML response
         """
-        stats = storage.get_statistics()
-        recent_messages = storage.get_all_messages(limit=10)
-        recent_calls = storage.get_all_calls(limit=10)
+        stats = await _in_thread(storage.get_statistics)
+        recent_messages = await _in_thread(storage.get_all_messages, limit=10)
+        recent_calls = await _in_thread(storage.get_all_calls, limit=10)
 
         return templates.TemplateResponse(
             "dashboard.html",
@@ -168,6 +288,7 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         )
 
     @app.get("/ui/messages", response_class=HTMLResponse)
+    @cached_page
     async def messages_list(request: Request, page: int = 1):
         """Messages list page.
 
@@ -178,13 +299,18 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         Returns:
             HTML response
         """
-        # Pagination
-        offset = (page - 1) * ITEMS_PER_PAGE
-        messages = storage.get_all_messages(limit=ITEMS_PER_PAGE, offset=offset)
-        stats = storage.get_statistics()
+        stats = await _in_thread(storage.get_statistics)
         total_messages = stats.get("messages", 0)
         total_pages = calculate_total_pages(total_messages)
 
+        # Pagination (skip the paged query when the table is empty)
+        messages = []
+        if total_messages:
+            offset = (page - 1) * ITEMS_PER_PAGE
+            messages = await _in_thread(
+                storage.get_all_messages, limit=ITEMS_PER_PAGE, offset=offset
+            )
+
         return templates.TemplateResponse(
             "messages.html",
             {
@@ -198,6 +324,7 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         )
 
     @app.get("/ui/calls", response_class=HTMLResponse)
+    @cached_page
     async def calls_list(request: Request, page: int = 1):
         """Calls list page.
 
@@ -208,13 +335,16 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         Returns:
             HTML response
         """
-        # Pagination
-        offset = (page - 1) * ITEMS_PER_PAGE
-        calls = storage.get_all_calls(limit=ITEMS_PER_PAGE, offset=offset)
-        stats = storage.get_statistics()
+        stats = await _in_thread(storage.get_statistics)
         total_calls = stats.get("calls", 0)
         total_pages = calculate_total_pages(total_calls)
 
+        # Pagination (skip the paged query when the table is empty)
+        calls = []
+        if total_calls:
+            offset = (page - 1) * ITEMS_PER_PAGE
+            calls = await _in_thread(storage.get_all_calls, limit=ITEMS_PER_PAGE, offset=offset)
+
         return templates.TemplateResponse(
             "calls.html",
             {
@@ -228,6 +358,7 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         )
 
     @app.get("/ui/callbacks", response_class=HTMLResponse)
+    @cached_page
     async def callbacks_list(request: Request, page: int = 1):
         """Callback logs page.
 
@@ -238,15 +369,20 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         Returns:
             HTML response
         """
-        # Pagination
-        offset = (page - 1) * ITEMS_PER_PAGE
-        callbacks = storage.get_all_callback_logs(limit=ITEMS_PER_PAGE, offset=offset)
-        stats = storage.get_statistics()
+        stats = await _in_thread(storage.get_statistics)
         total_callbacks = stats.get("callbacks", 0)
         total_pages = calculate_total_pages(total_callbacks)
 
-        # Parse JSON payloads
-        parse_callback_payloads(callbacks)
+        # Pagination (skip the paged query when the table is empty)
+        callbacks = []
+        if total_callbacks:
+            offset = (page - 1) * ITEMS_PER_PAGE
+            callbacks = await _in_thread(
+                storage.get_all_callback_logs, limit=ITEMS_PER_PAGE, offset=offset
+            )
+
+            # Parse JSON payloads
+            await _in_thread(parse_callback_payloads, callbacks)
 
         return templates.TemplateResponse(
             "callbacks.html",
@@ -270,7 +406,7 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         Returns:
             HTML fragment
         """
-        stats = storage.get_statistics()
+        stats = await _in_thread(storage.get_statistics)
         return templates.TemplateResponse(
             "fragments/stats.html",
             {
@@ -289,7 +425,7 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         Returns:
             HTML fragment
         """
-        recent_messages = storage.get_all_messages(limit=10)
+        recent_messages = await _in_thread(storage.get_all_messages, limit=10)
         return templates.TemplateResponse(
             "fragments/recent_messages.html",
             {
@@ -308,7 +444,7 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         Returns:
             HTML fragment
         """
-        recent_calls = storage.get_all_calls(limit=10)
+        recent_calls = await _in_thread(storage.get_all_calls, limit=10)
         return templates.TemplateResponse(
             "fragments/recent_calls.html",
             {
@@ -318,6 +454,7 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         )
 
     @app.get("/ui/fragments/messages-table", response_class=HTMLResponse)
+    @cached_page
     async def messages_table_fragment(request: Request, page: int = 1):
         """Messages table fragment for HTMX polling.
 
@@ -328,12 +465,18 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         Returns:
             HTML fragment
         """
-        offset = (page - 1) * ITEMS_PER_PAGE
-        messages = storage.get_all_messages(limit=ITEMS_PER_PAGE, offset=offset)
-        stats = storage.get_statistics()
+        stats = await _in_thread(storage.get_statistics)
         total_messages = stats.get("messages", 0)
         total_pages = calculate_total_pages(total_messages)
 
+        # Pagination (skip the paged query when the table is empty)
+        messages = []
+        if total_messages:
+            offset = (page - 1) * ITEMS_PER_PAGE
+            messages = await _in_thread(
+                storage.get_all_messages, limit=ITEMS_PER_PAGE, offset=offset
+            )
+
         return templates.TemplateResponse(
             "fragments/messages_table.html",
             {
@@ -345,6 +488,7 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         )
 
     @app.get("/ui/fragments/calls-table", response_class=HTMLResponse)
+    @cached_page
     async def calls_table_fragment(request: Request, page: int = 1):
         """Calls table fragment for HTMX polling.
 
@@ -355,12 +499,16 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         Returns:
             HTML fragment
         """
-        offset = (page - 1) * ITEMS_PER_PAGE
-        calls = storage.get_all_calls(limit=ITEMS_PER_PAGE, offset=offset)
-        stats = storage.get_statistics()
+        stats = await _in_thread(storage.get_statistics)
         total_calls = stats.get("calls", 0)
         total_pages = calculate_total_pages(total_calls)
 
+        # Pagination (skip the paged query when the table is empty)
+        calls = []
+        if total_calls:
+            offset = (page - 1) * ITEMS_PER_PAGE
+            calls = await _in_thread(storage.get_all_calls, limit=ITEMS_PER_PAGE, offset=offset)
+
         return templates.TemplateResponse(
             "fragments/calls_table.html",
             {
@@ -372,6 +520,7 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         )
 
     @app.get("/ui/fragments/callbacks-table", response_class=HTMLResponse)
+    @cached_page
     async def callbacks_table_fragment(request: Request, page: int = 1):
         """Callbacks table fragment for HTMX polling.
 
@@ -382,14 +531,20 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         Returns:
             HTML fragment
         """
-        offset = (page - 1) * ITEMS_PER_PAGE
-        callbacks = storage.get_all_callback_logs(limit=ITEMS_PER_PAGE, offset=offset)
-        stats = storage.get_statistics()
+        stats = await _in_thread(storage.get_statistics)
         total_callbacks = stats.get("callbacks", 0)
         total_pages = calculate_total_pages(total_callbacks)
 
-        # Parse JSON payloads
-        parse_callback_payloads(callbacks)
+        # Pagination (skip the paged query when the table is empty)
+        callbacks = []
+        if total_callbacks:
+            offset = (page - 1) * ITEMS_PER_PAGE
+            callbacks = await _in_thread(
+                storage.get_all_callback_logs, limit=ITEMS_PER_PAGE, offset=offset
+            )
+
+            # Parse JSON payloads
+            await _in_thread(parse_callback_payloads, callbacks)
 
         return templates.TemplateResponse(
             "fragments/callbacks_table.html",
@@ -412,7 +567,7 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         Returns:
             HTML fragment with message details
         """
-        message = storage.get_message(message_sid)
+        message = await _in_thread(storage.get_message, message_sid)
         if not message:
             return HTMLResponse(
                 content="<div class='modal-body'><p>Message not found</p></div>",
@@ -438,7 +593,7 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         Returns:
             HTML fragment with call details
         """
-        call = storage.get_call(call_sid)
+        call = await _in_thread(storage.get_call, call_sid)
         if not call:
             return HTMLResponse(
                 content="<div class='modal-body'><p>Call not found</p></div>",
@@ -464,7 +619,7 @@ def setup_ui_routes(app, storage: Storage, config: Config):
         Returns:
             HTML fragment with callback details
         """
-        callback = storage.get_callback(callback_id)
+        callback = await _in_thread(storage.get_callback, callback_id)
         if not callback:
             return HTMLResponse(
                 content="<div class='modal-body'><p>Callback not found</p></div>",
@@ -3,6 +3,8 @@
 
 import hashlib
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import rcssmin
@@ -12,6 +14,8 @@ import rjsmin
 STATIC_DIR = Path("static")
 DIST_DIR = STATIC_DIR / "dist"
 MANIFEST_PATH = STATIC_DIR / "manifest.json"
+# Build state stays outside the publicly served static/ directory
+BUILD_CACHE_PATH = Path(".build-cache") / "assets.json"
 
 # Files to process (source path relative to STATIC_DIR)
 ASSETS = [
@@ -22,31 +26,97 @@ ASSETS = [
 
 
 def compute_hash(content: bytes, length: int = 8) -> str:
-    """Compute short hash of content."""
-    return hashlib.md5(content).hexdigest()[:length]
+    """Compute short hash of content.
+
+    BLAKE2b is asked for exactly length // 2 bytes, so the hex digest is
+    already the requested length.
+    """
+    return hashlib.blake2b(content, digest_size=length // 2).hexdigest()
 
 
-def minify_css(content: str) -> str:
+def minify_css(content: bytes) -> bytes:
     """Minify CSS content."""
     return rcssmin.cssmin(content)
 
 
-def minify_js(content: str) -> str:
+def minify_js(content: bytes) -> bytes:
     """Minify JavaScript content."""
     return rjsmin.jsmin(content)
 
 
-def process_file(source_path: Path) -> tuple[str, str]:
+def load_build_cache() -> dict[str, dict]:
+    """Load the build-state sidecar from the previous run.
+
+    Returns:
+        Mapping of source path to its cached build entry, or an empty
+        dict when there is no usable cache
+    """
+    try:
+        cache = json.loads(BUILD_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def write_json_atomic(path: Path, data: dict) -> None:
+    """Write JSON to a temporary file and move it into place.
+
+    Args:
+        path: Destination file
+        data: JSON-serializable data
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def dist_path_for_url(versioned_url: str) -> Path:
+    """Map a versioned URL back to the built file it points at.
+
+    Args:
+        versioned_url: URL as written to the manifest
+
+    Returns:
+        Path of the built file
+    """
+    return STATIC_DIR / versioned_url.split("?")[0].removeprefix("/static/")
+
+
+def process_file(source_path: Path, entry: dict | None) -> tuple[str, str, dict]:
     """Process a single file: minify and compute hash.
 
+    Unchanged sources (same mtime and size as the cached entry, with the
+    built file still on disk) are skipped without reading or minifying.
+    Runs in a worker process, so the updated cache entry is returned
+    rather than stored.
+
     Args:
         source_path: Path to source file relative to STATIC_DIR
+        entry: Cached build entry from the previous run, if any
 
     Returns:
-        Tuple of (original_url, versioned_url)
+        Tuple of (original_url, versioned_url, cache_entry)
     """
     full_path = STATIC_DIR / source_path
-    content = full_path.read_text(encoding="utf-8")
+    original_url = f"/static/{source_path}"
+    cached_exists = entry is not None and dist_path_for_url(entry["versioned_url"]).exists()
+
+    stat = full_path.stat()
+    if (
+        cached_exists
+        and entry.get("mtime_ns") == stat.st_mtime_ns
+        and entry.get("size") == stat.st_size
+    ):
+        return original_url, entry["versioned_url"], entry
+
+    content = full_path.read_bytes()
+    source_hash = compute_hash(content)
+
+    # Touched but unchanged sources only need their fingerprint refreshed
+    if cached_exists and entry.get("source_hash") == source_hash:
+        entry = {**entry, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        return original_url, entry["versioned_url"], entry
 
     # Minify based on file type
     suffix = source_path.suffix.lower()
@@ -58,29 +128,64 @@ def process_file(source_path: Path) -> tuple[str, str]:
         minified = content
 
     # Compute hash from minified content
-    content_hash = compute_hash(minified.encode("utf-8"))
+    content_hash = compute_hash(minified)
 
-    # Create output path: dist/css/style.css or dist/js/htmx.min.js
-    output_path = DIST_DIR / source_path
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(minified, encoding="utf-8")
+    # Create output path: dist/css/style.<hash>.css or dist/js/htmx.min.<hash>.js.
+    # The name embeds the content hash, so an existing file already has this content.
+    output_name = f"{source_path.stem}.{content_hash}{source_path.suffix}"
+    output_path = DIST_DIR / source_path.parent / output_name
+    if not output_path.exists():
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(minified)
 
-    # Return URL mapping
-    original_url = f"/static/{source_path}"
-    versioned_url = f"/static/dist/{source_path}?v={content_hash}"
+    versioned_url = f"/static/dist/{source_path.parent / output_name}"
+    entry = {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "source_hash": source_hash,
+        "content_hash": content_hash,
+        "versioned_url": versioned_url,
+    }
 
-    return original_url, versioned_url
+    return original_url, versioned_url, entry
+
+
+def remove_orphans(keep: set[Path]) -> None:
+    """Delete built files that no longer correspond to an asset.
+
+    Args:
+        keep: Output paths produced by the current build
+    """
+    if not DIST_DIR.exists():
+        return
+
+    for path in DIST_DIR.rglob("*"):
+        if path.is_file() and path not in keep:
+            path.unlink()
+            print(f"  removed {path}")
 
 
 def build_assets() -> dict[str, str]:
     """Build all assets and return manifest."""
     manifest = {}
-
-    for asset in ASSETS:
-        source_path = Path(asset)
-        original_url, versioned_url = process_file(source_path)
-        manifest[original_url] = versioned_url
-        print(f"  {original_url} -> {versioned_url}")
+    old_cache = load_build_cache()
+    new_cache = {}
+
+    # Minify files in parallel; map() keeps results in ASSETS order
+    max_workers = min(len(ASSETS), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            process_file,
+            [Path(asset) for asset in ASSETS],
+            [old_cache.get(asset) for asset in ASSETS],
+        )
+        for asset, (original_url, versioned_url, entry) in zip(ASSETS, results, strict=True):
+            manifest[original_url] = versioned_url
+            new_cache[asset] = entry
+            print(f"  {original_url} -> {versioned_url}")
+
+    # Only current assets are kept, so removed ones drop out of the cache
+    write_json_atomic(BUILD_CACHE_PATH, new_cache)
 
     return manifest
 
@@ -89,20 +194,14 @@ def main():
     """Main entry point."""
     print("Building assets...")
 
-    # Clean dist directory
-    if DIST_DIR.exists():
-        import shutil
-
-        shutil.rmtree(DIST_DIR)
-
     # Build assets
     manifest = build_assets()
 
+    # Drop built files the new manifest no longer references
+    remove_orphans({dist_path_for_url(url) for url in manifest.values()})
+
     # Write manifest
-    MANIFEST_PATH.write_text(
-        json.dumps(manifest, indent=2),
-        encoding="utf-8",
-    )
+    write_json_atomic(MANIFEST_PATH, manifest)
     print(f"\nManifest written to {MANIFEST_PATH}")
     print("Done!")
 
@@ -1,22 +1,55 @@
 """Shared pytest fixtures for SMS Mock Server tests."""
 
+import base64
+from functools import cache
+from types import MappingProxyType
+from unittest.mock import patch
+
 import pytest
-from unittest.mock import AsyncMock, patch
+import yaml
+
+try:
+    from yaml import CSafeDumper as YamlDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as YamlDumper
 
 from app.config import Config
-from app.storage import Storage
 from app.template_engine import TemplateEngine
+from tests.helpers import SavepointStorage
 
+ACCOUNT_SID = "AC" + "x" * 32
+AUTH_TOKEN = "test_auth_token_12345"
 
-@pytest.fixture
+_BASIC_AUTH = "Basic " + base64.b64encode(f"{ACCOUNT_SID}:{AUTH_TOKEN}".encode()).decode()
+
+_SAMPLE_MESSAGE_DATA = MappingProxyType(
+    {
+        "From": "+15550000001",
+        "To": "+15551234567",
+        "Body": "Test message",
+        "StatusCallback": "http://localhost:8080/callback-test",
+    }
+)
+
+_SAMPLE_CALL_DATA = MappingProxyType(
+    {
+        "From": "+15550000001",
+        "To": "+15551234567",
+        "Url": "http://example.com/twiml",
+        "StatusCallback": "http://localhost:8080/callback-test",
+    }
+)
+
+
+@pytest.fixture(scope="session")
 def test_config_dict():
     """Return a test configuration dictionary."""
     return {
         "server": {"host": "0.0.0.0", "port": 8080},
         "provider": "twilio",
         "twilio": {
-            "account_sid": "AC" + "x" * 32,
-            "auth_token": "test_auth_token_12345",
+            "account_sid": ACCOUNT_SID,
+            "auth_token": AUTH_TOKEN,
             "validation": {
                 "require_auth": True,
                 "validate_phone_format": True,
@@ -39,105 +72,112 @@ def test_config_dict():
     }
 
 
-@pytest.fixture
-def test_config_file(tmp_path, test_config_dict):
+@pytest.fixture(scope="session")
+def test_config_file(tmp_path_factory, test_config_dict):
     """Create a temporary test configuration file."""
-    import yaml
+    tmp_path = tmp_path_factory.mktemp("config")
 
     # Create templates directory
     templates_dir = tmp_path / "templates" / "responses"
     templates_dir.mkdir(parents=True)
 
-    # Update config dict to use temp templates path
-    test_config_dict["templates"]["path"] = str(templates_dir)
+    # Point a copy of the shared config dict at the temp templates path
+    config_dict = {**test_config_dict, "templates": {"path": str(templates_dir)}}
 
     # Create config file
     config_file = tmp_path / "config.yaml"
-    with open(config_file, "w") as f:
-        yaml.dump(test_config_dict, f)
+    config_file.write_text(yaml.dump(config_dict, Dumper=YamlDumper))
 
     return str(config_file)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_config(test_config_file):
     """Create a test Config instance."""
     return Config(test_config_file)
 
 
-@pytest.fixture
-def test_storage(tmp_path):
-    """Create a test Storage instance with temporary file database."""
-    db_file = tmp_path / "test.db"
-    storage = Storage(str(db_file))
+@pytest.fixture(scope="session")
+def _shared_storage():
+    """Create one in-memory Storage so the schema is built once per session."""
+    storage = SavepointStorage()
     yield storage
-    # Cleanup: remove the temporary database file
-    if db_file.exists():
-        db_file.unlink()
+    storage.close()
 
 
 @pytest.fixture
-def test_template_engine(tmp_path):
+def test_storage(_shared_storage):
+    """Provide the shared Storage with writes rolled back after each test."""
+    with _shared_storage.savepoint():
+        yield _shared_storage
+
+
+@pytest.fixture(scope="session")
+def test_template_engine(tmp_path_factory):
     """Create a test TemplateEngine instance."""
+    tmp_path = tmp_path_factory.mktemp("engine")
+
     # Create templates directory
     templates_dir = tmp_path / "templates" / "responses"
     templates_dir.mkdir(parents=True, exist_ok=True)
 
-    # Create errors directory
-    errors_dir = tmp_path / "templates" / "errors"
-    errors_dir.mkdir(parents=True, exist_ok=True)
+    return TemplateEngine(templates_path=str(templates_dir), provider="twilio", auto_reload=False)
 
-    return TemplateEngine(templates_path=str(templates_dir), provider="twilio")
 
+@cache
+def _build_provider(fields: frozenset):
+    """Build one TwilioProvider per distinct set of TwilioConfig fields."""
+    # Imported here so runs that never build a provider skip loading phonenumbers
+    from app.config import TwilioConfig
+    from app.providers.twilio import TwilioProvider
 
-@pytest.fixture
-def mock_httpx_client():
-    """Mock httpx.AsyncClient for testing callbacks."""
-    mock_client = AsyncMock()
-    mock_response = AsyncMock()
-    mock_response.status_code = 200
-    mock_response.text = "OK"
-    mock_client.post.return_value = mock_response
+    return TwilioProvider(TwilioConfig(**dict(fields)))
+
+
+@pytest.fixture(scope="session")
+def provider_for():
+    """Factory returning a shared TwilioProvider for TwilioConfig field values.
+
+    Providers are cached by exact field equality for the whole session, so
+    parametrized tests asking for the same config share one instance. List
+    values are accepted and frozen like TwilioConfig does for number lists.
+    """
+
+    def _get(**fields):
+        return _build_provider(
+            frozenset(
+                (key, tuple(value) if isinstance(value, list) else value)
+                for key, value in fields.items()
+            )
+        )
+
+    return _get
 
-    with patch("httpx.AsyncClient", return_value=mock_client):
-        yield mock_client
+
+async def _nop_sleep(*args, **kwargs):
+    """Return immediately in place of asyncio.sleep."""
 
 
 @pytest.fixture
 def mock_async_sleep():
     """Mock asyncio.sleep to avoid delays in tests."""
-    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
-        yield mock_sleep
+    with patch("asyncio.sleep", _nop_sleep):
+        yield _nop_sleep
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_message_data():
-    """Sample message request data."""
-    return {
-        "From": "+15550000001",
-        "To": "+15551234567",
-        "Body": "Test message",
-        "StatusCallback": "http://localhost:8080/callback-test",
-    }
+    """Sample message request data (read-only; copy with dict() to modify)."""
+    return _SAMPLE_MESSAGE_DATA
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_call_data():
-    """Sample call request data."""
-    return {
-        "From": "+15550000001",
-        "To": "+15551234567",
-        "Url": "http://example.com/twiml",
-        "StatusCallback": "http://localhost:8080/callback-test",
-    }
+    """Sample call request data (read-only; copy with dict() to modify)."""
+    return _SAMPLE_CALL_DATA
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_basic_auth():
     """Mock basic auth header."""
-    import base64
-
-    account_sid = "AC" + "x" * 32
-    auth_token = "test_auth_token_12345"
-    credentials = base64.b64encode(f"{account_sid}:{auth_token}".encode()).decode()
-    return f"Basic {credentials}"
+    return _BASIC_AUTH
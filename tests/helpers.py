@@ -0,0 +1,33 @@
+"""Test-only helpers shared by conftest and test modules."""
+
+import sqlite3
+from contextlib import contextmanager
+
+from app.storage import Storage
+
+
+class SavepointStorage(Storage):
+    """In-memory Storage whose writes can be rolled back with savepoint()."""
+
+    def __init__(self):
+        """Initialize a private in-memory database."""
+        super().__init__(":memory:")
+
+    @contextmanager
+    def savepoint(self):
+        """Discard every write made inside the block.
+
+        While the savepoint is open the connection runs in autocommit mode,
+        so the commit() calls made by write methods are no-ops and cannot
+        release the savepoint.
+        """
+        with self._get_connection() as conn:
+            conn.autocommit = True
+            conn.execute("SAVEPOINT storage_savepoint")
+        try:
+            yield
+        finally:
+            with self._get_connection() as conn:
+                conn.execute("ROLLBACK TO SAVEPOINT storage_savepoint")
+                conn.execute("RELEASE SAVEPOINT storage_savepoint")
+                conn.autocommit = sqlite3.LEGACY_TRANSACTION_CONTROL
@@ -1,5 +1,6 @@
 """Tests for callbacks module."""
 
+import httpx
 import pytest
 import respx
 from httpx import Response
@@ -125,6 +126,29 @@ class TestSendCallback:
             assert success is True
             assert code == status_code
 
+    @pytest.mark.asyncio
+    async def test_send_callback_uses_injected_client(
+        self, test_config, test_storage, test_template_engine
+    ):
+        """Test that an injected HTTP client is used instead of a new one."""
+        requests = []
+
+        def handle(request):
+            requests.append(request)
+            return Response(202, text="Accepted")
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handle)) as client:
+            handler = CallbackHandler(
+                test_config, test_storage, test_template_engine, http_client=client
+            )
+            success, code, body = await handler.send_callback(
+                "http://example.com/callback", {"MessageSid": "SM123"}, attempt=1
+            )
+
+        assert (success, code, body) == (True, 202, "Accepted")
+        assert len(requests) == 1
+        assert requests[0].content == b"MessageSid=SM123"
+
 
 class TestSendCallbackWithRetry:
     """Tests for send_callback_with_retry method."""
@@ -204,7 +228,7 @@ class TestSendCallbackWithRetry:
 
         # Should have max_attempts (3) logged
         logs = test_storage.get_all_callback_logs()
-        max_attempts = test_config.twilio.callbacks.retry_attempts
+        max_attempts = test_config.twilio.callbacks_retry_attempts
         assert len(logs) == max_attempts
         # Logs are ordered DESC (newest first), so sort by attempt_number
         sorted_logs = sorted(logs, key=lambda x: x["attempt_number"])
@@ -1,5 +1,8 @@
 """Tests for configuration module."""
 
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+
 import pytest
 import yaml
 
@@ -15,92 +18,108 @@ from app.config import (
     load_config,
 )
 
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+TEST_ACCOUNT_SID = "AC" + "x" * 32
+TEST_AUTH_TOKEN = "test_token"
+
+# Valid config sections shared by tests; derive variants with {**_VALID, ...}
+# shallow merges rather than rebuilding literals or deep-copying
+_VALID = {
+    "server": {"host": "0.0.0.0", "port": 8080},
+    "provider": "twilio",
+    "twilio": {
+        "account_sid": TEST_ACCOUNT_SID,
+        "auth_token": TEST_AUTH_TOKEN,
+        "validation": {"require_auth": True},
+    },
+}
+
 
 class TestServerConfig:
     """Tests for ServerConfig class."""
 
-    def test_default_values(self):
-        """Test ServerConfig with empty dict uses defaults."""
-        config = ServerConfig({})
-        assert config.host == "0.0.0.0"
-        assert config.port == 8080
-        assert config.timezone == "UTC"
-
-    def test_custom_values(self):
-        """Test ServerConfig with custom values."""
-        data = {"host": "127.0.0.1", "port": 9000, "timezone": "America/New_York"}
-        config = ServerConfig(data)
-        assert config.host == "127.0.0.1"
-        assert config.port == 9000
-        assert config.timezone == "America/New_York"
-
-    def test_partial_values(self):
-        """Test ServerConfig with partial custom values."""
-        data = {"port": 3000}
-        config = ServerConfig(data)
-        assert config.host == "0.0.0.0"
-        assert config.port == 3000
-        assert config.timezone == "UTC"
-
-    def test_custom_timezone_only(self):
-        """Test ServerConfig with only timezone set."""
-        data = {"timezone": "Asia/Tokyo"}
-        config = ServerConfig(data)
-        assert config.host == "0.0.0.0"
-        assert config.port == 8080
-        assert config.timezone == "Asia/Tokyo"
+    @pytest.mark.parametrize(
+        "data,expected",
+        [
+            ({}, ("0.0.0.0", 8080, "UTC")),
+            (
+                {"host": "127.0.0.1", "port": 9000, "timezone": "America/New_York"},
+                ("127.0.0.1", 9000, "America/New_York"),
+            ),
+            ({"port": 3000}, ("0.0.0.0", 3000, "UTC")),
+            ({"timezone": "Asia/Tokyo"}, ("0.0.0.0", 8080, "Asia/Tokyo")),
+        ],
+        ids=["defaults", "custom", "partial", "timezone_only"],
+    )
+    def test_values(self, data, expected):
+        """Test ServerConfig fills missing keys with defaults."""
+        config = ServerConfig.from_dict(data)
+        assert (config.host, config.port, config.timezone) == expected
+
+    def test_is_frozen(self):
+        """Test ServerConfig instances cannot be modified."""
+        config = ServerConfig.from_dict({})
+        with pytest.raises(FrozenInstanceError):
+            config.port = 9000
 
 
 class TestValidationConfig:
     """Tests for ValidationConfig class."""
 
-    def test_default_values(self):
-        """Test ValidationConfig with empty dict uses defaults."""
-        config = ValidationConfig({})
-        assert config.require_auth is True
-        assert config.validate_phone_format is True
-        assert config.check_from_numbers is True
-        assert config.require_parameters is True
-
-    def test_custom_values(self):
-        """Test ValidationConfig with all custom values."""
-        data = {
-            "require_auth": False,
-            "validate_phone_format": False,
-            "check_from_numbers": False,
-            "require_parameters": False,
-        }
-        config = ValidationConfig(data)
-        assert config.require_auth is False
-        assert config.validate_phone_format is False
-        assert config.check_from_numbers is False
-        assert config.require_parameters is False
+    @pytest.mark.parametrize(
+        "data,expected",
+        [
+            ({}, True),
+            (
+                {
+                    "require_auth": False,
+                    "validate_phone_format": False,
+                    "check_from_numbers": False,
+                    "require_parameters": False,
+                },
+                False,
+            ),
+        ],
+        ids=["defaults", "custom"],
+    )
+    def test_values(self, data, expected):
+        """Test ValidationConfig defaults and custom values."""
+        config = ValidationConfig.from_dict(data)
+        assert config.require_auth is expected
+        assert config.validate_phone_format is expected
+        assert config.check_from_numbers is expected
+        assert config.require_parameters is expected
 
 
 class TestCallbackConfig:
     """Tests for CallbackConfig class."""
 
-    def test_default_values(self):
-        """Test CallbackConfig with empty dict uses defaults."""
-        config = CallbackConfig({})
-        assert config.enabled is True
-        assert config.delay_seconds == 2
-        assert config.retry_attempts == 3
-        assert config.retry_delay_seconds == 5
-
-    def test_custom_values(self):
-        """Test CallbackConfig with custom values."""
-        data = {
-            "enabled": False,
-            "delay_seconds": 10,
-            "retry_attempts": 5,
-            "retry_delay_seconds": 15,
-        }
-        config = CallbackConfig(data)
-        assert config.enabled is False
-        assert config.delay_seconds == 10
-        assert config.retry_attempts == 5
-        assert config.retry_delay_seconds == 15
+    @pytest.mark.parametrize(
+        "data,expected",
+        [
+            ({}, (True, 2, 3, 5)),
+            (
+                {
+                    "enabled": False,
+                    "delay_seconds": 10,
+                    "retry_attempts": 5,
+                    "retry_delay_seconds": 15,
+                },
+                (False, 10, 5, 15),
+            ),
+        ],
+        ids=["defaults", "custom"],
+    )
+    def test_values(self, data, expected):
+        """Test CallbackConfig defaults and custom values."""
+        config = CallbackConfig.from_dict(data)
+        assert (
+            config.enabled,
+            config.delay_seconds,
+            config.retry_attempts,
+            config.retry_delay_seconds,
+        ) == expected
 
 
 class TestDatabaseConfig:
@@ -108,13 +127,13 @@ class TestDatabaseConfig:
 
     def test_default_path(self):
         """Test DatabaseConfig with empty dict uses default path."""
-        config = DatabaseConfig({})
+        config = DatabaseConfig.from_dict({})
         assert config.path == "./data/mock_server.db"
 
     def test_custom_path(self):
         """Test DatabaseConfig with custom path."""
         data = {"path": "/custom/path/db.sqlite"}
-        config = DatabaseConfig(data)
+        config = DatabaseConfig.from_dict(data)
         assert config.path == "/custom/path/db.sqlite"
 
 
@@ -123,13 +142,13 @@ class TestTemplatesConfig:
 
     def test_default_path(self):
         """Test TemplatesConfig with empty dict uses default path."""
-        config = TemplatesConfig({})
+        config = TemplatesConfig.from_dict({})
         assert config.path == "./templates/responses"
 
     def test_custom_path(self):
         """Test TemplatesConfig with custom path."""
         data = {"path": "/custom/templates"}
-        config = TemplatesConfig(data)
+        config = TemplatesConfig.from_dict(data)
         assert config.path == "/custom/templates"
 
 
@@ -139,15 +158,17 @@ class TestTwilioConfig:
     def test_default_values(self):
         """Test TwilioConfig with minimal data."""
         data = {}
-        config = TwilioConfig(data)
+        config = TwilioConfig.from_dict(data)
         assert config.account_sid == ""
         assert config.auth_token == ""
         assert config.default_behavior == "success"
-        assert config.registered_numbers == []
-        assert config.allowed_from_numbers == []
-        assert config.failure_numbers == []
-        assert config.validation.require_auth is True
-        assert config.callbacks.enabled is True
+        assert config.registered_numbers == frozenset()
+        assert config.allowed_from_numbers == frozenset()
+        assert config.failure_numbers == frozenset()
+        assert config.validation_require_auth is True
+        assert config.callbacks_enabled is True
+        assert config.validation_validate_phone_format is True
+        assert config.callbacks_delay_seconds == 2
 
     def test_custom_values(self):
         """Test TwilioConfig with custom values."""
@@ -161,119 +182,107 @@ class TestTwilioConfig:
             "validation": {"require_auth": False},
             "callbacks": {"enabled": False},
         }
-        config = TwilioConfig(data)
+        config = TwilioConfig.from_dict(data)
         assert config.account_sid == "AC123456"
         assert config.auth_token == "token123"
         assert config.default_behavior == "failure"
-        assert config.registered_numbers == ["+1234567890"]
-        assert config.allowed_from_numbers == ["+0987654321"]
-        assert config.failure_numbers == ["+1111111111"]
-        assert config.validation.require_auth is False
-        assert config.callbacks.enabled is False
+        assert config.registered_numbers == {"+1234567890"}
+        assert config.allowed_from_numbers == {"+0987654321"}
+        assert config.failure_numbers == {"+1111111111"}
+        assert config.validation_require_auth is False
+        assert config.callbacks_enabled is False
+        assert config.validation_check_from_numbers is True
+        assert config.callbacks_retry_attempts == 3
 
     def test_invalid_default_behavior(self):
         """Test TwilioConfig raises error for invalid default_behavior."""
         data = {"default_behavior": "invalid"}
         with pytest.raises(ConfigurationError) as exc:
-            TwilioConfig(data)
+            TwilioConfig.from_dict(data)
         assert "default_behavior must be 'success' or 'failure'" in str(exc.value)
 
-    def test_validate_success_with_auth(self):
-        """Test TwilioConfig.validate() passes with valid auth credentials."""
-        data = {
-            "account_sid": "AC" + "x" * 32,
-            "auth_token": "valid_token",
-            "validation": {"require_auth": True},
-        }
-        config = TwilioConfig(data)
-        config.validate()
-
-    def test_validate_fails_with_missing_account_sid(self):
-        """Test TwilioConfig.validate() fails when account_sid is missing."""
-        data = {
-            "account_sid": "",
-            "auth_token": "valid_token",
-            "validation": {"require_auth": True},
-        }
-        config = TwilioConfig(data)
-        with pytest.raises(ConfigurationError) as exc:
-            config.validate()
-        assert "account_sid must be set" in str(exc.value)
-
-    def test_validate_fails_with_placeholder_account_sid(self):
-        """Test TwilioConfig.validate() fails when account_sid is placeholder."""
-        data = {
-            "account_sid": "ACXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX",
-            "auth_token": "valid_token",
-            "validation": {"require_auth": True},
-        }
-        config = TwilioConfig(data)
-        with pytest.raises(ConfigurationError) as exc:
-            config.validate()
-        assert "account_sid must be set" in str(exc.value)
-
-    def test_validate_fails_with_missing_auth_token(self):
-        """Test TwilioConfig.validate() fails when auth_token is missing."""
-        data = {
-            "account_sid": "AC" + "x" * 32,
-            "auth_token": "",
-            "validation": {"require_auth": True},
-        }
-        config = TwilioConfig(data)
-        with pytest.raises(ConfigurationError) as exc:
+    @pytest.mark.parametrize(
+        "account_sid,auth_token,require_auth,expected_error",
+        [
+            (TEST_ACCOUNT_SID, "valid_token", True, None),
+            ("", "valid_token", True, "account_sid must be set"),
+            ("ACXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX", "valid_token", True, "account_sid must be set"),
+            (TEST_ACCOUNT_SID, "", True, "auth_token must be set"),
+            (TEST_ACCOUNT_SID, "your_auth_token_here", True, "auth_token must be set"),
+            ("", "", False, None),
+        ],
+        ids=[
+            "valid_auth",
+            "missing_account_sid",
+            "placeholder_account_sid",
+            "missing_auth_token",
+            "placeholder_auth_token",
+            "auth_not_required",
+        ],
+    )
+    def test_validate_cases(self, account_sid, auth_token, require_auth, expected_error):
+        """Test TwilioConfig.validate() credential checks."""
+        config = TwilioConfig.from_dict(
+            {
+                **_VALID["twilio"],
+                "account_sid": account_sid,
+                "auth_token": auth_token,
+                "validation": {"require_auth": require_auth},
+            }
+        )
+        if expected_error is None:
             config.validate()
-        assert "auth_token must be set" in str(exc.value)
-
-    def test_validate_fails_with_placeholder_auth_token(self):
-        """Test TwilioConfig.validate() fails when auth_token is placeholder."""
-        data = {
-            "account_sid": "AC" + "x" * 32,
-            "auth_token": "your_auth_token_here",
-            "validation": {"require_auth": True},
-        }
-        config = TwilioConfig(data)
-        with pytest.raises(ConfigurationError) as exc:
-            config.validate()
-        assert "auth_token must be set" in str(exc.value)
-
-    def test_validate_skips_when_auth_not_required(self):
-        """Test TwilioConfig.validate() passes when require_auth is False."""
-        data = {
-            "account_sid": "",
-            "auth_token": "",
-            "validation": {"require_auth": False},
-        }
-        config = TwilioConfig(data)
-        config.validate()
+        else:
+            with pytest.raises(ConfigurationError, match=expected_error):
+                config.validate()
+
+
+@pytest.fixture(scope="module")
+def make_config(tmp_path_factory):
+    """Return a factory that writes config files derived from a shared base.
+
+    Keyword overrides replace top-level sections; dict values are merged
+    one level deep into the base section and None removes the section.
+    Identical configs are written only once per module.
+    """
+    root = tmp_path_factory.mktemp("configs")
+    templates_dir = root / "templates"
+    templates_dir.mkdir()
+
+    base = {
+        **_VALID,
+        "database": {"path": str(root / "test.db")},
+        "templates": {"path": str(templates_dir)},
+    }
+    written: dict[str, str] = {}
+
+    def _make_config(**overrides):
+        data = {**base}
+        for key, value in overrides.items():
+            if value is None:
+                data.pop(key, None)
+            elif isinstance(value, dict) and isinstance(data.get(key), dict):
+                data[key] = {**data[key], **value}
+            else:
+                data[key] = value
+
+        text = yaml.dump(data, Dumper=_YAML_DUMPER)
+        if text not in written:
+            config_file = root / f"config_{len(written)}.yaml"
+            config_file.write_text(text)
+            written[text] = str(config_file)
+        return written[text]
+
+    return _make_config
 
 
 class TestConfig:
     """Tests for main Config class."""
 
     @pytest.fixture
-    def valid_config_file(self, tmp_path):
-        """Create a valid temporary config file."""
-        config_data = {
-            "server": {"host": "0.0.0.0", "port": 8080},
-            "database": {"path": str(tmp_path / "test.db")},
-            "templates": {"path": str(tmp_path / "templates")},
-            "provider": "twilio",
-            "twilio": {
-                "account_sid": "AC" + "x" * 32,
-                "auth_token": "test_token",
-                "validation": {"require_auth": True},
-            },
-        }
-
-        # Create templates directory
-        templates_dir = tmp_path / "templates"
-        templates_dir.mkdir()
-
-        config_file = tmp_path / "config.yaml"
-        with open(config_file, "w") as f:
-            yaml.dump(config_data, f)
-
-        return str(config_file)
+    def valid_config_file(self, make_config):
+        """Return the path of a valid config file."""
+        return make_config()
 
     def test_load_valid_config(self, valid_config_file):
         """Test loading a valid configuration file."""
@@ -281,7 +290,16 @@ class TestConfig:
         assert config.server.host == "0.0.0.0"
         assert config.server.port == 8080
         assert config.provider == "twilio"
-        assert config.twilio.account_sid == "AC" + "x" * 32
+        assert config.twilio.account_sid == TEST_ACCOUNT_SID
+
+    def test_reparses_modified_file(self, valid_config_file, tmp_path):
+        """Test Config re-reads a previously loaded file after it changes."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(Path(valid_config_file).read_text())
+        assert Config(str(config_file)).server.port == 8080
+
+        config_file.write_text(config_file.read_text().replace("port: 8080", "port: 80"))
+        assert Config(str(config_file)).server.port == 80
 
     def test_config_file_not_found(self):
         """Test Config raises error when file doesn't exist."""
@@ -298,138 +316,56 @@ class TestConfig:
             Config(str(config_file))
         assert "Config file is empty" in str(exc.value)
 
-    def test_unsupported_provider(self, tmp_path):
+    def test_unsupported_provider(self, make_config):
         """Test Config raises error for unsupported provider."""
-        config_data = {
-            "server": {},
-            "provider": "nexmo",
-            "twilio": {"account_sid": "test", "auth_token": "test"},
-        }
-
-        templates_dir = tmp_path / "templates"
-        templates_dir.mkdir()
-
-        config_file = tmp_path / "config.yaml"
-        with open(config_file, "w") as f:
-            yaml.dump(config_data, f)
-
         with pytest.raises(ConfigurationError) as exc:
-            Config(str(config_file))
+            Config(make_config(provider="nexmo"))
         assert "Unsupported provider" in str(exc.value)
         assert "Only 'twilio' is supported" in str(exc.value)
 
-    def test_missing_twilio_section(self, tmp_path):
+    def test_missing_twilio_section(self, make_config):
         """Test Config raises error when Twilio section is missing."""
-        config_data = {
-            "server": {},
-            "provider": "twilio",
-        }
-
-        config_file = tmp_path / "config.yaml"
-        with open(config_file, "w") as f:
-            yaml.dump(config_data, f)
-
         with pytest.raises(ConfigurationError) as exc:
-            Config(str(config_file))
+            Config(make_config(twilio=None))
         assert "Twilio configuration section is missing" in str(exc.value)
 
-    def test_templates_directory_not_found(self, tmp_path):
+    def test_templates_directory_not_found(self, make_config):
         """Test Config raises error when templates directory doesn't exist."""
-        config_data = {
-            "server": {},
-            "database": {"path": str(tmp_path / "test.db")},
-            "templates": {"path": "/nonexistent/templates"},
-            "provider": "twilio",
-            "twilio": {
-                "account_sid": "AC" + "x" * 32,
-                "auth_token": "test_token",
-                "validation": {"require_auth": True},
-            },
-        }
-
-        config_file = tmp_path / "config.yaml"
-        with open(config_file, "w") as f:
-            yaml.dump(config_data, f)
-
         with pytest.raises(ConfigurationError) as exc:
-            Config(str(config_file))
+            Config(make_config(templates={"path": "/nonexistent/templates"}))
         assert "Templates directory not found" in str(exc.value)
 
-    def test_database_directory_created(self, tmp_path):
+    def test_database_directory_created(self, make_config, tmp_path):
         """Test Config creates database directory if it doesn't exist."""
         db_dir = tmp_path / "data" / "nested"
-        templates_dir = tmp_path / "templates"
-        templates_dir.mkdir()
-
-        config_data = {
-            "server": {},
-            "database": {"path": str(db_dir / "test.db")},
-            "templates": {"path": str(templates_dir)},
-            "provider": "twilio",
-            "twilio": {
-                "account_sid": "AC" + "x" * 32,
-                "auth_token": "test_token",
-                "validation": {"require_auth": True},
-            },
-        }
 
-        config_file = tmp_path / "config.yaml"
-        with open(config_file, "w") as f:
-            yaml.dump(config_data, f)
-
-        Config(str(config_file))
+        Config(make_config(database={"path": str(db_dir / "test.db")}))
         assert db_dir.exists()
 
-    def test_config_from_env_variable(self, tmp_path, monkeypatch):
+    def test_config_from_env_variable(self, make_config, monkeypatch):
         """Test Config uses CONFIG_PATH environment variable."""
-        config_data = {
-            "server": {},
-            "database": {"path": str(tmp_path / "test.db")},
-            "templates": {"path": str(tmp_path / "templates")},
-            "provider": "twilio",
-            "twilio": {
-                "account_sid": "AC" + "x" * 32,
-                "auth_token": "test_token",
-                "validation": {"require_auth": True},
-            },
-        }
-
-        templates_dir = tmp_path / "templates"
-        templates_dir.mkdir()
-
-        config_file = tmp_path / "env_config.yaml"
-        with open(config_file, "w") as f:
-            yaml.dump(config_data, f)
-
-        monkeypatch.setenv("CONFIG_PATH", str(config_file))
+        monkeypatch.setenv("CONFIG_PATH", make_config())
         config = Config()
-        assert config.twilio.account_sid == "AC" + "x" * 32
+        assert config.twilio.account_sid == TEST_ACCOUNT_SID
 
 
 class TestLoadConfig:
     """Tests for load_config function."""
 
-    def test_load_config_wrapper(self, tmp_path):
+    def test_load_config_wrapper(self, make_config):
         """Test load_config function returns Config object."""
-        config_data = {
-            "server": {},
-            "database": {"path": str(tmp_path / "test.db")},
-            "templates": {"path": str(tmp_path / "templates")},
-            "provider": "twilio",
-            "twilio": {
-                "account_sid": "AC" + "x" * 32,
-                "auth_token": "test_token",
-                "validation": {"require_auth": True},
-            },
-        }
+        config = load_config(make_config())
+        assert isinstance(config, Config)
+        assert config.provider == "twilio"
 
-        templates_dir = tmp_path / "templates"
-        templates_dir.mkdir()
+    def test_load_config_validates_every_call(self, make_config, tmp_path):
+        """Test each load_config call builds a new Config and re-runs validate()."""
+        db_dir = tmp_path / "db"
+        config_path = make_config(database={"path": str(db_dir / "test.db")})
 
-        config_file = tmp_path / "config.yaml"
-        with open(config_file, "w") as f:
-            yaml.dump(config_data, f)
+        first = load_config(config_path)
+        db_dir.rmdir()
+        second = load_config(config_path)
 
-        config = load_config(str(config_file))
-        assert isinstance(config, Config)
-        assert config.provider == "twilio"
+        assert second is not first
+        assert db_dir.is_dir()
@@ -2,23 +2,61 @@
 
 import base64
 
+import pytest
+
 from app.main import extract_basic_auth
 
+_USERNAME = "test_user"
+_PASSWORD = "test_pass"
+_COLON_PASSWORD = "pass:word:with:colons"
+
+
+def _basic(credentials: bytes) -> str:
+    """Build a Basic Authorization header from raw credentials."""
+    return "Basic " + base64.b64encode(credentials).decode()
+
+
+_VALID_HEADER = _basic(b"test_user:test_pass")
+_NO_COLON_HEADER = _basic(b"usernameonly")
+_EMPTY_USERNAME_HEADER = _basic(b":test_pass")
+_EMPTY_PASSWORD_HEADER = _basic(b"test_user:")
+_COLON_PASSWORD_HEADER = _basic(b"test_user:pass:word:with:colons")
+
 
 class TestExtractBasicAuth:
     """Tests for extract_basic_auth function."""
 
     def test_valid_basic_auth(self):
         """Test extraction with valid Basic Auth header."""
-        username = "test_user"
-        password = "test_pass"
-        credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
-        auth_header = f"Basic {credentials}"
-
-        result_user, result_pass = extract_basic_auth(auth_header)
-
-        assert result_user == username
-        assert result_pass == password
+        result_user, result_pass = extract_basic_auth(_VALID_HEADER)
+
+        assert result_user == _USERNAME
+        assert result_pass == _PASSWORD
+
+    def test_valid_basic_auth_bytes(self):
+        """Test extraction from a raw bytes header."""
+        result_user, result_pass = extract_basic_auth(_VALID_HEADER.encode())
+
+        assert result_user == _USERNAME
+        assert result_pass == _PASSWORD
+
+    @pytest.mark.parametrize(
+        "header",
+        [
+            _VALID_HEADER + "\n",
+            _VALID_HEADER + "\r\n",
+            _VALID_HEADER + "  ",
+            "Basic  " + _VALID_HEADER.removeprefix("Basic "),
+            "Basic \t" + _VALID_HEADER.removeprefix("Basic ") + "\t",
+        ],
+    )
+    @pytest.mark.parametrize("as_bytes", [False, True])
+    def test_whitespace_padded_credentials(self, header, as_bytes):
+        """Test whitespace around the base64 credentials is ignored."""
+        result_user, result_pass = extract_basic_auth(header.encode() if as_bytes else header)
+
+        assert result_user == _USERNAME
+        assert result_pass == _PASSWORD
 
     def test_missing_authorization_header(self):
         """Test with missing Authorization header returns (None, None)."""
@@ -47,47 +85,35 @@ class TestExtractBasicAuth:
 
     def test_missing_colon_in_credentials(self):
         """Test with valid base64 but no colon separator."""
-        credentials = base64.b64encode(b"usernameonly").decode()
-        auth_header = f"Basic {credentials}"
+        result_user, result_pass = extract_basic_auth(_NO_COLON_HEADER)
 
-        result_user, result_pass = extract_basic_auth(auth_header)
-
-        # Should handle ValueError from split
         assert result_user is None
         assert result_pass is None
 
     def test_empty_username(self):
         """Test with empty username but valid format."""
-        username = ""
-        password = "test_pass"
-        credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
-        auth_header = f"Basic {credentials}"
-
-        result_user, result_pass = extract_basic_auth(auth_header)
+        result_user, result_pass = extract_basic_auth(_EMPTY_USERNAME_HEADER)
 
         assert result_user == ""
-        assert result_pass == password
+        assert result_pass == _PASSWORD
 
     def test_empty_password(self):
         """Test with empty password but valid format."""
-        username = "test_user"
-        password = ""
-        credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
-        auth_header = f"Basic {credentials}"
-
-        result_user, result_pass = extract_basic_auth(auth_header)
+        result_user, result_pass = extract_basic_auth(_EMPTY_PASSWORD_HEADER)
 
-        assert result_user == username
+        assert result_user == _USERNAME
         assert result_pass == ""
 
     def test_password_with_colon(self):
         """Test password containing colon character."""
-        username = "test_user"
-        password = "pass:word:with:colons"
-        credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
-        auth_header = f"Basic {credentials}"
+        result_user, result_pass = extract_basic_auth(_COLON_PASSWORD_HEADER)
 
-        result_user, result_pass = extract_basic_auth(auth_header)
+        assert result_user == _USERNAME
+        assert result_pass == _COLON_PASSWORD
+
+    def test_invalid_utf8_credentials(self):
+        """Test credentials that are not valid UTF-8 are rejected."""
+        result_user, result_pass = extract_basic_auth(_basic(b"test_user:\xff\xfe"))
 
-        assert result_user == username
-        assert result_pass == password
+        assert result_user is None
+        assert result_pass is None
@@ -1,391 +1,292 @@
 """Tests for providers module."""
 
-from app.config import TwilioConfig
-from app.providers.twilio import TwilioProvider
+from types import MappingProxyType
 
+import pytest
 
-class TestTwilioProviderInitialization:
-    """Tests for TwilioProvider initialization."""
+from app.providers.base import ErrorType, ValidationError
 
-    def test_init_with_config(self):
-        """Test TwilioProvider initialization with config."""
-        config = TwilioConfig(
-            {
-                "account_sid": "AC123",
-                "auth_token": "token123",
-            }
-        )
+pytestmark = pytest.mark.unit
 
-        provider = TwilioProvider(config)
-        assert provider.config == config
+_REQUIRED = ("To", "From", "Body")
+_FULL_REQUEST = MappingProxyType(
+    {"To": "+1234567890", "From": "+0987654321", "Body": "Test message"}
+)
+_MISSING_FROM = MappingProxyType({"To": "+1234567890", "Body": "Test message"})
+_EMPTY_FROM = MappingProxyType({**_FULL_REQUEST, "From": ""})
 
 
-class TestValidateAuth:
-    """Tests for validate_auth method."""
+@pytest.fixture(scope="module")
+def auth_provider(provider_for):
+    """Provider with authentication enforced."""
+    return provider_for(account_sid="AC123", auth_token="token123", validation_require_auth=True)
 
-    def test_validate_auth_success(self):
-        """Test successful authentication."""
-        config = TwilioConfig(
-            {
-                "account_sid": "AC123",
-                "auth_token": "token123",
-                "validation": {"require_auth": True},
-            }
-        )
 
-        provider = TwilioProvider(config)
-        is_valid, error = provider.validate_auth("AC123", "token123")
+@pytest.fixture(scope="module")
+def validation_provider(provider_for):
+    """Provider with required parameter checks enabled."""
+    return provider_for(validation_require_parameters=True)
 
-        assert is_valid is True
-        assert error is None
 
-    def test_validate_auth_wrong_credentials(self):
-        """Test authentication with wrong credentials."""
-        config = TwilioConfig(
-            {
-                "account_sid": "AC123",
-                "auth_token": "token123",
-                "validation": {"require_auth": True},
-            }
-        )
-
-        provider = TwilioProvider(config)
-        is_valid, error = provider.validate_auth("WRONG", "wrong")
-
-        assert is_valid is False
-        assert error["error_type"] == "auth_failed"
-        assert error["http_status"] == 401
-
-    def test_validate_auth_missing_username(self):
-        """Test authentication with missing username."""
-        config = TwilioConfig(
-            {
-                "account_sid": "AC123",
-                "auth_token": "token123",
-                "validation": {"require_auth": True},
-            }
-        )
-
-        provider = TwilioProvider(config)
-        is_valid, error = provider.validate_auth(None, "token123")
-
-        assert is_valid is False
-        assert error["error_type"] == "auth_failed"
-        assert error["http_status"] == 401
-
-    def test_validate_auth_missing_password(self):
-        """Test authentication with missing password."""
-        config = TwilioConfig(
-            {
-                "account_sid": "AC123",
-                "auth_token": "token123",
-                "validation": {"require_auth": True},
-            }
-        )
-
-        provider = TwilioProvider(config)
-        is_valid, error = provider.validate_auth("AC123", None)
-
-        assert is_valid is False
-        assert error["error_type"] == "auth_failed"
-        assert error["http_status"] == 401
-
-    def test_validate_auth_disabled(self):
-        """Test authentication when auth is disabled."""
-        config = TwilioConfig(
-            {
-                "account_sid": "AC123",
-                "auth_token": "token123",
-                "validation": {"require_auth": False},
-            }
-        )
+@pytest.fixture(scope="module")
+def phone_provider(provider_for):
+    """Provider with E.164 phone format validation enabled."""
+    return provider_for(validation_validate_phone_format=True)
 
-        provider = TwilioProvider(config)
-        is_valid, error = provider.validate_auth(None, None)
 
-        assert is_valid is True
-        assert error is None
+@pytest.fixture(scope="module")
+def from_number_provider(provider_for):
+    """Provider restricting From numbers to an allowed list."""
+    return provider_for(
+        validation_check_from_numbers=True,
+        allowed_from_numbers=["+12125551234", "+12125555678"],
+    )
 
 
-class TestValidateParameters:
-    """Tests for validate_parameters method."""
+@pytest.fixture(scope="module")
+def empty_provider(provider_for):
+    """Provider with an empty config, for template name lookups."""
+    return provider_for()
 
-    def test_validate_parameters_success(self):
-        """Test successful parameter validation."""
-        config = TwilioConfig({"validation": {"require_parameters": True}})
-        provider = TwilioProvider(config)
 
-        request_data = {
-            "To": "+1234567890",
-            "From": "+0987654321",
-            "Body": "Test message",
+# ---------------------------------------------------------------------------
+# TwilioProvider initialization
+# ---------------------------------------------------------------------------
+def test_init_with_config():
+    """Test TwilioProvider initialization with config."""
+    from app.config import TwilioConfig
+    from app.providers.twilio import TwilioProvider
+
+    config = TwilioConfig.from_dict(
+        {
+            "account_sid": "AC123",
+            "auth_token": "token123",
         }
+    )
+
+    provider = TwilioProvider(config)
+    assert provider.config == config
+
+
+# ---------------------------------------------------------------------------
+# validate_auth method
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize(
+    ("username", "password", "expected_valid"),
+    [
+        ("AC123", "token123", True),
+        ("WRONG", "wrong", False),
+        (None, "token123", False),
+        ("AC123", None, False),
+    ],
+    ids=["success", "wrong_credentials", "missing_username", "missing_password"],
+)
+def test_validate_auth(auth_provider, username, password, expected_valid):
+    """Test authentication against the configured credentials."""
+    is_valid, error = auth_provider.validate_auth(username, password)
+
+    assert is_valid is expected_valid
+    if expected_valid:
+        assert error is None
+    else:
+        assert error.error_type is ErrorType.AUTH_FAILED
+        assert error.http_status == 401
 
-        is_valid, error = provider.validate_parameters(
-            request_data, ["To", "From", "Body"]
-        )
 
-        assert is_valid is True
-        assert error is None
+def test_validate_auth_disabled(provider_for):
+    """Test authentication when auth is disabled."""
+    provider = provider_for(
+        account_sid="AC123", auth_token="token123", validation_require_auth=False
+    )
 
-    def test_validate_parameters_missing_param(self):
-        """Test parameter validation with missing parameter."""
-        config = TwilioConfig({"validation": {"require_parameters": True}})
-        provider = TwilioProvider(config)
+    is_valid, error = provider.validate_auth(None, None)
 
-        request_data = {
-            "To": "+1234567890",
-            "Body": "Test message",
-        }
+    assert is_valid is True
+    assert error is None
 
-        is_valid, error = provider.validate_parameters(
-            request_data, ["To", "From", "Body"]
-        )
 
-        assert is_valid is False
-        assert error["error_type"] == "missing_parameter"
-        assert error["http_status"] == 400
-        assert error["parameter"] == "From"
+# ---------------------------------------------------------------------------
+# validate_parameters method
+# ---------------------------------------------------------------------------
+def test_validate_parameters_success(validation_provider):
+    """Test successful parameter validation."""
+    is_valid, error = validation_provider.validate_parameters(_FULL_REQUEST, _REQUIRED)
 
-    def test_validate_parameters_empty_value(self):
-        """Test parameter validation with empty value."""
-        config = TwilioConfig({"validation": {"require_parameters": True}})
-        provider = TwilioProvider(config)
+    assert is_valid is True
+    assert error is None
 
-        request_data = {
-            "To": "+1234567890",
-            "From": "",
-            "Body": "Test message",
-        }
 
-        is_valid, error = provider.validate_parameters(
-            request_data, ["To", "From", "Body"]
-        )
+def test_validate_parameters_missing_param(validation_provider):
+    """Test parameter validation with missing parameter."""
+    is_valid, error = validation_provider.validate_parameters(_MISSING_FROM, _REQUIRED)
 
-        assert is_valid is False
-        assert error["error_type"] == "missing_parameter"
-        assert error["parameter"] == "From"
+    assert is_valid is False
+    assert error.error_type is ErrorType.MISSING_PARAMETER
+    assert error.http_status == 400
+    assert error.parameter == "From"
 
-    def test_validate_parameters_disabled(self):
-        """Test parameter validation when disabled."""
-        config = TwilioConfig({"validation": {"require_parameters": False}})
-        provider = TwilioProvider(config)
 
-        request_data = {}
+def test_validate_parameters_empty_value(validation_provider):
+    """Test parameter validation with empty value."""
+    is_valid, error = validation_provider.validate_parameters(_EMPTY_FROM, _REQUIRED)
 
-        is_valid, error = provider.validate_parameters(
-            request_data, ["To", "From", "Body"]
-        )
+    assert is_valid is False
+    assert error.error_type is ErrorType.MISSING_PARAMETER
+    assert error.parameter == "From"
 
-        assert is_valid is True
-        assert error is None
 
+def test_validate_parameters_disabled(provider_for):
+    """Test parameter validation when disabled."""
+    provider = provider_for(validation_require_parameters=False)
 
-class TestValidatePhoneNumber:
-    """Tests for validate_phone_number method."""
+    is_valid, error = provider.validate_parameters({}, _REQUIRED)
 
-    def test_validate_phone_number_valid_e164(self):
-        """Test validation with valid E.164 phone number."""
-        config = TwilioConfig({"validation": {"validate_phone_format": True}})
-        provider = TwilioProvider(config)
+    assert is_valid is True
+    assert error is None
 
-        is_valid, error = provider.validate_phone_number("+12125551234", "To")
 
-        assert is_valid is True
-        assert error is None
+# ---------------------------------------------------------------------------
+# validate_phone_number method
+# ---------------------------------------------------------------------------
+def test_validate_phone_number_valid_e164(phone_provider):
+    """Test validation with valid E.164 phone number."""
+    is_valid, error = phone_provider.validate_phone_number("+12125551234", "To")
 
-    def test_validate_phone_number_invalid_format(self):
-        """Test validation with invalid phone number format."""
-        config = TwilioConfig({"validation": {"validate_phone_format": True}})
-        provider = TwilioProvider(config)
+    assert is_valid is True
+    assert error is None
 
-        is_valid, error = provider.validate_phone_number("123", "To")
 
-        assert is_valid is False
-        assert error["error_type"] == "invalid_phone_number"
-        assert error["http_status"] == 400
-        assert error["field"] == "To"
-        assert error["number"] == "123"
+@pytest.mark.parametrize(
+    ("number", "field_name"),
+    [("123", "To"), ("(212) 555-1234", "From")],
+    ids=["invalid_format", "non_e164"],
+)
+def test_validate_phone_number_invalid(phone_provider, number, field_name):
+    """Test validation rejects numbers that are not valid E.164."""
+    is_valid, error = phone_provider.validate_phone_number(number, field_name)
 
-    def test_validate_phone_number_non_e164(self):
-        """Test validation with non-E.164 format."""
-        config = TwilioConfig({"validation": {"validate_phone_format": True}})
-        provider = TwilioProvider(config)
+    assert is_valid is False
+    assert error == ValidationError(
+        error_type=ErrorType.INVALID_PHONE_NUMBER,
+        http_status=400,
+        field=field_name,
+        number=number,
+    )
 
-        is_valid, error = provider.validate_phone_number("(212) 555-1234", "From")
 
-        assert is_valid is False
-        assert error["error_type"] == "invalid_phone_number"
-        assert error["field"] == "From"
+def test_validate_phone_number_disabled(provider_for):
+    """Test validation when phone format validation is disabled."""
+    provider = provider_for(validation_validate_phone_format=False)
 
-    def test_validate_phone_number_disabled(self):
-        """Test validation when phone format validation is disabled."""
-        config = TwilioConfig({"validation": {"validate_phone_format": False}})
-        provider = TwilioProvider(config)
+    is_valid, error = provider.validate_phone_number("invalid", "To")
 
-        is_valid, error = provider.validate_phone_number("invalid", "To")
+    assert is_valid is True
+    assert error is None
 
-        assert is_valid is True
-        assert error is None
 
+# ---------------------------------------------------------------------------
+# validate_from_number method
+# ---------------------------------------------------------------------------
+def test_validate_from_number_in_allowed_list(from_number_provider):
+    """Test validation with number in allowed list."""
+    is_valid, error = from_number_provider.validate_from_number("+12125551234")
 
-class TestValidateFromNumber:
-    """Tests for validate_from_number method."""
+    assert is_valid is True
+    assert error is None
 
-    def test_validate_from_number_in_allowed_list(self):
-        """Test validation with number in allowed list."""
-        config = TwilioConfig(
-            {
-                "validation": {"check_from_numbers": True},
-                "allowed_from_numbers": ["+12125551234", "+12125555678"],
-            }
-        )
-        provider = TwilioProvider(config)
 
-        is_valid, error = provider.validate_from_number("+12125551234")
+def test_validate_from_number_not_in_allowed_list(from_number_provider):
+    """Test validation with number not in allowed list."""
+    is_valid, error = from_number_provider.validate_from_number("+19995551234")
 
-        assert is_valid is True
-        assert error is None
+    assert is_valid is False
+    assert error.error_type is ErrorType.INVALID_FROM_NUMBER
+    assert error.http_status == 400
+    assert error.from_number == "+19995551234"
 
-    def test_validate_from_number_not_in_allowed_list(self):
-        """Test validation with number not in allowed list."""
-        config = TwilioConfig(
-            {
-                "validation": {"check_from_numbers": True},
-                "allowed_from_numbers": ["+12125551234"],
-            }
-        )
-        provider = TwilioProvider(config)
-
-        is_valid, error = provider.validate_from_number("+19995551234")
-
-        assert is_valid is False
-        assert error["error_type"] == "invalid_from_number"
-        assert error["http_status"] == 400
-        assert error["from_number"] == "+19995551234"
-
-    def test_validate_from_number_disabled(self):
-        """Test validation when from number check is disabled."""
-        config = TwilioConfig(
-            {
-                "validation": {"check_from_numbers": False},
-                "allowed_from_numbers": [],
-            }
-        )
-        provider = TwilioProvider(config)
 
-        is_valid, error = provider.validate_from_number("+19995551234")
+def test_validate_from_number_disabled(provider_for):
+    """Test validation when from number check is disabled."""
+    provider = provider_for(validation_check_from_numbers=False, allowed_from_numbers=[])
 
-        assert is_valid is True
-        assert error is None
+    is_valid, error = provider.validate_from_number("+19995551234")
 
+    assert is_valid is True
+    assert error is None
 
-class TestShouldSucceed:
-    """Tests for should_succeed method."""
 
-    def test_should_succeed_in_failure_list(self):
-        """Test should_succeed with number in failure list."""
-        config = TwilioConfig(
-            {
-                "default_behavior": "success",
-                "registered_numbers": ["+11111111111"],
-                "failure_numbers": ["+12222222222"],
-            }
-        )
-        provider = TwilioProvider(config)
-
-        # Failure numbers have highest priority
-        assert provider.should_succeed("+12222222222") is False
-
-    def test_should_succeed_in_registered_list(self):
-        """Test should_succeed with number in registered list."""
-        config = TwilioConfig(
-            {
-                "default_behavior": "failure",
-                "registered_numbers": ["+11111111111"],
-                "failure_numbers": [],
-            }
-        )
-        provider = TwilioProvider(config)
-
-        assert provider.should_succeed("+11111111111") is True
-
-    def test_should_succeed_default_success(self):
-        """Test should_succeed with unknown number and default_behavior=success."""
-        config = TwilioConfig(
-            {
-                "default_behavior": "success",
-                "registered_numbers": [],
-                "failure_numbers": [],
-            }
-        )
-        provider = TwilioProvider(config)
+# ---------------------------------------------------------------------------
+# should_succeed method
+# ---------------------------------------------------------------------------
+_REGISTERED = "+11111111111"
+_FAILING = "+12222222222"
+_UNKNOWN = "+19995551234"
 
-        assert provider.should_succeed("+19995551234") is True
 
-    def test_should_succeed_default_failure(self):
-        """Test should_succeed with unknown number and default_behavior=failure."""
-        config = TwilioConfig(
+@pytest.fixture(
+    scope="module",
+    params=[
+        (
             {
-                "default_behavior": "failure",
-                "registered_numbers": [],
-                "failure_numbers": [],
-            }
-        )
-        provider = TwilioProvider(config)
-
-        assert provider.should_succeed("+19995551234") is False
-
-    def test_should_succeed_priority_failure_over_registered(self):
-        """Test that failure list takes priority over registered list."""
-        config = TwilioConfig(
+                "default_behavior": "success",
+                "registered_numbers": [_REGISTERED],
+                "failure_numbers": [_FAILING],
+            },
+            {_REGISTERED: True, _FAILING: False, _UNKNOWN: True},
+        ),
+        (
+            {"default_behavior": "failure", "registered_numbers": [_REGISTERED]},
+            {_REGISTERED: True, _FAILING: False, _UNKNOWN: False},
+        ),
+        (
             {
                 "default_behavior": "success",
-                "registered_numbers": ["+11111111111"],
-                "failure_numbers": ["+11111111111"],
-            }
-        )
-        provider = TwilioProvider(config)
-
-        # Failure should win
-        assert provider.should_succeed("+11111111111") is False
-
-
-class TestGetResponseTemplate:
-    """Tests for get_response_template method."""
-
-    def test_get_response_template_success(self):
-        """Test getting response template for success."""
-        config = TwilioConfig({})
-        provider = TwilioProvider(config)
-
-        template = provider.get_response_template("send_sms", success=True)
-        assert template == "send_sms_success.json"
-
-    def test_get_response_template_failure(self):
-        """Test getting response template for failure."""
-        config = TwilioConfig({})
-        provider = TwilioProvider(config)
-
-        template = provider.get_response_template("make_call", success=False)
-        assert template == "make_call_failure.json"
-
-
-class TestGetErrorTemplate:
-    """Tests for get_error_template method."""
-
-    def test_get_error_template(self):
-        """Test getting error template."""
-        config = TwilioConfig({})
-        provider = TwilioProvider(config)
-
-        template = provider.get_error_template("auth_failed")
-        assert template == "auth_failed.json"
-
-    def test_get_error_template_missing_parameter(self):
-        """Test getting error template for missing parameter."""
-        config = TwilioConfig({})
-        provider = TwilioProvider(config)
-
-        template = provider.get_error_template("missing_parameter")
-        assert template == "missing_parameter.json"
+                "registered_numbers": [_REGISTERED],
+                "failure_numbers": [_REGISTERED],
+            },
+            {_REGISTERED: False, _FAILING: True, _UNKNOWN: True},
+        ),
+    ],
+    ids=["default_success", "default_failure", "failure_over_registered"],
+)
+def should_succeed_case(request, provider_for):
+    """Provider per number-list config, with the expected outcome per number."""
+    config_dict, outcomes = request.param
+    return provider_for(**config_dict), outcomes
+
+
+@pytest.mark.parametrize(
+    "to_number", [_REGISTERED, _FAILING, _UNKNOWN], ids=["registered", "failing", "unknown"]
+)
+def test_should_succeed(should_succeed_case, to_number):
+    """Test failure list, then registered list, then default_behavior."""
+    provider, outcomes = should_succeed_case
+
+    assert provider.should_succeed(to_number) is outcomes[to_number]
+
+
+# ---------------------------------------------------------------------------
+# get_response_template and get_error_template methods
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize(
+    ("action", "success", "expected"),
+    [
+        ("send_sms", True, "send_sms_success.json"),
+        ("make_call", False, "make_call_failure.json"),
+    ],
+)
+def test_get_response_template(empty_provider, action, success, expected):
+    """Test response template names for success and failure."""
+    assert empty_provider.get_response_template(action, success=success) == expected
+
+
+@pytest.mark.parametrize(
+    ("error_type", "expected"),
+    [
+        ("auth_failed", "auth_failed.json"),
+        ("missing_parameter", "missing_parameter.json"),
+    ],
+)
+def test_get_error_template(empty_provider, error_type, expected):
+    """Test error template names."""
+    assert empty_provider.get_error_template(error_type) == expected
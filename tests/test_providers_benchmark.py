@@ -0,0 +1,68 @@
+"""Benchmarks for the hot TwilioProvider validation paths.
+
+Benchmarks are disabled in normal test runs; use ``make bench`` to time them
+and compare against the last saved run.
+"""
+
+import pytest
+
+from app.providers.base import ValidationError
+
+pytestmark = pytest.mark.benchmark(group="providers")
+
+_FROM_NUMBERS = [f"+1212555{n:04d}" for n in range(100)]
+
+# Phone checks clear the number cache before each round so they time phonenumbers
+_PHONE_ROUNDS = 1000
+
+
+@pytest.fixture(scope="module")
+def phone_provider(provider_for):
+    """Provider with E.164 phone format validation enabled."""
+    return provider_for(validation_validate_phone_format=True)
+
+
+@pytest.fixture(scope="module")
+def from_number_provider(provider_for):
+    """Provider with a hundred allowed From numbers."""
+    return provider_for(validation_check_from_numbers=True, allowed_from_numbers=_FROM_NUMBERS)
+
+
+@pytest.fixture(scope="module")
+def should_succeed_provider(provider_for):
+    """Provider with registered and failure numbers."""
+    return provider_for(registered_numbers=["+11111111111"], failure_numbers=["+12222222222"])
+
+
+def _bench_uncached(benchmark, func, *args):
+    """Benchmark func with the phone number cache cleared before every round."""
+    from app.providers.twilio import _is_valid_number
+
+    return benchmark.pedantic(
+        func, args=args, setup=_is_valid_number.cache_clear, rounds=_PHONE_ROUNDS
+    )
+
+
+def test_bench_validate_phone_number(benchmark, phone_provider):
+    """Benchmark validating a well-formed E.164 number."""
+    result = _bench_uncached(benchmark, phone_provider.validate_phone_number, "+12125551234", "To")
+
+    assert result == (True, None)
+
+
+def test_bench_validate_phone_number_invalid(benchmark, phone_provider):
+    """Benchmark rejecting a malformed number."""
+    is_valid, error = _bench_uncached(benchmark, phone_provider.validate_phone_number, "123", "To")
+
+    assert is_valid is False
+    assert isinstance(error, ValidationError)
+
+
+def test_bench_validate_from_number(benchmark, from_number_provider):
+    """Benchmark the allowed From number lookup."""
+    assert benchmark(from_number_provider.validate_from_number, _FROM_NUMBERS[-1]) == (True, None)
+
+
+def test_bench_should_succeed(benchmark, should_succeed_provider):
+    """Benchmark resolving a registered number."""
+    assert benchmark(should_succeed_provider.should_succeed, "+11111111111") is True
@@ -1,8 +1,54 @@
 """Tests for storage module."""
 
+import threading
+
 import pytest
 
 from app.storage import Storage
+from tests.helpers import SavepointStorage
+
+_MESSAGE_COLUMNS = ("message_sid", "provider", "from_number", "to_number", "body", "status")
+_CALL_COLUMNS = ("call_sid", "provider", "from_number", "to_number", "status")
+_CALLBACK_LOG_COLUMNS = ("target_url", "payload")
+
+
+@pytest.fixture
+def storage(test_storage):
+    """Session-shared in-memory storage whose writes are rolled back after each test."""
+    return test_storage
+
+
+def _fetchone(storage, query, params=()):
+    """Run a direct query, holding the storage's connection only while it runs.
+
+    Args:
+        storage: Storage to query
+        query: SQL query
+        params: Query parameters
+
+    Returns:
+        The first result row
+    """
+    with storage._get_connection() as conn:
+        return conn.execute(query, params).fetchone()
+
+
+def _bulk_insert(storage, table, columns, rows):
+    """Insert many rows in one transaction, bypassing the per-row create_* calls.
+
+    Args:
+        storage: Storage to insert into
+        table: Table name
+        columns: Column names, in row order
+        rows: Row tuples
+    """
+    placeholders = ", ".join("?" * len(columns))
+    with storage._get_connection() as conn:
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+            rows,
+        )
+        conn.commit()
 
 
 class TestStorageInitialization:
@@ -21,60 +67,62 @@ class TestStorageInitialization:
         assert db_path.exists()
         assert db_path.parent.exists()
 
-    def test_init_creates_messages_table(self, tmp_path):
-        """Test that Storage creates messages table."""
-        db_path = tmp_path / "test.db"
-        storage = Storage(str(db_path))
+    def test_connections_use_wal_with_normal_sync(self, tmp_path):
+        """Test that file connections run in WAL mode with synchronous=NORMAL."""
+        storage = Storage(str(tmp_path / "test.db"))
         with storage._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='messages'"
-            )
-            assert cursor.fetchone() is not None
-
-    def test_init_creates_calls_table(self, tmp_path):
-        """Test that Storage creates calls table."""
-        db_path = tmp_path / "test.db"
-        storage = Storage(str(db_path))
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            # PRAGMA synchronous reports NORMAL as 1
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_init_in_memory_keeps_data(self, tmp_path, monkeypatch):
+        """Test that an in-memory Storage persists data across calls."""
+        monkeypatch.chdir(tmp_path)
+        storage = Storage(":memory:")
+        storage.create_message("SM123", "twilio", "+1111111111", "+2222222222", "Hi", "queued")
+        assert storage.get_message("SM123") is not None
+        assert not (tmp_path / ":memory:").exists()
+        storage.close()
+
+    def test_savepoint_discards_writes(self):
+        """Test that writes inside the test-only savepoint() are rolled back."""
+        storage = SavepointStorage()
+        storage.create_message("SM1", "twilio", "+1111111111", "+2222222222", "Hi", "queued")
+        with storage.savepoint():
+            storage.create_message("SM2", "twilio", "+1111111111", "+2222222222", "Hi", "queued")
+            storage.update_message_status("SM1", "delivered")
+            assert storage.get_message("SM2") is not None
+        assert storage.get_message("SM2") is None
+        assert storage.get_message("SM1")["status"] == "queued"
+        storage.close()
+
+    def test_in_memory_connection_is_serialized(self):
+        """Test that other threads wait while the in-memory connection is in use."""
+        storage = Storage(":memory:")
+        done = threading.Event()
+        worker = threading.Thread(target=lambda: (storage.get_statistics(), done.set()))
+
+        with storage._get_connection():
+            worker.start()
+            assert not done.wait(0.1)
+        worker.join(timeout=5)
+
+        assert done.is_set()
+        storage.close()
+
+    def test_init_creates_tables(self, tmp_path):
+        """Test that Storage creates every schema table."""
+        storage = Storage(str(tmp_path / "test.db"))
         with storage._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='calls'"
-            )
-            assert cursor.fetchone() is not None
-
-    def test_init_creates_delivery_events_table(self, tmp_path):
-        """Test that Storage creates delivery_events table."""
-        db_path = tmp_path / "test.db"
-        storage = Storage(str(db_path))
-        with storage._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='delivery_events'"
-            )
-            assert cursor.fetchone() is not None
-
-    def test_init_creates_callback_logs_table(self, tmp_path):
-        """Test that Storage creates callback_logs table."""
-        db_path = tmp_path / "test.db"
-        storage = Storage(str(db_path))
-        with storage._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='callback_logs'"
-            )
-            assert cursor.fetchone() is not None
+            rows = conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+
+        names = {row[0] for row in rows}
+        assert {"messages", "calls", "delivery_events", "callback_logs"} <= names
 
 
 class TestMessageOperations:
     """Tests for message CRUD operations."""
 
-    @pytest.fixture
-    def storage(self, tmp_path):
-        """Create temporary file storage for testing."""
-        db_path = tmp_path / "test.db"
-        return Storage(str(db_path))
-
     def test_create_message(self, storage):
         """Test creating a message."""
         message_id = storage.create_message(
@@ -163,10 +211,15 @@ class TestMessageOperations:
 
     def test_get_all_messages_with_limit(self, storage):
         """Test getting messages with limit."""
-        for i in range(10):
-            storage.create_message(
-                f"SM{i}", "twilio", "+1111111111", "+2222222222", f"Msg {i}", "sent"
-            )
+        _bulk_insert(
+            storage,
+            "messages",
+            _MESSAGE_COLUMNS,
+            [
+                (f"SM{i}", "twilio", "+1111111111", "+2222222222", f"Msg {i}", "sent")
+                for i in range(10)
+            ],
+        )
 
         messages = storage.get_all_messages(limit=5)
         assert len(messages) == 5
@@ -191,12 +244,6 @@ class TestMessageOperations:
 class TestCallOperations:
     """Tests for call CRUD operations."""
 
-    @pytest.fixture
-    def storage(self, tmp_path):
-        """Create temporary file storage for testing."""
-        db_path = tmp_path / "test.db"
-        return Storage(str(db_path))
-
     def test_create_call(self, storage):
         """Test creating a call."""
         call_id = storage.create_call(
@@ -281,10 +328,12 @@ class TestCallOperations:
 
     def test_get_all_calls_with_pagination(self, storage):
         """Test getting calls with pagination."""
-        for i in range(10):
-            storage.create_call(
-                f"CA{i}", "twilio", "+1111111111", "+2222222222", "completed"
-            )
+        _bulk_insert(
+            storage,
+            "calls",
+            _CALL_COLUMNS,
+            [(f"CA{i}", "twilio", "+1111111111", "+2222222222", "completed") for i in range(10)],
+        )
 
         calls = storage.get_all_calls(limit=3, offset=2)
         assert len(calls) == 3
@@ -293,12 +342,6 @@ class TestCallOperations:
 class TestDeliveryEventOperations:
     """Tests for delivery event operations."""
 
-    @pytest.fixture
-    def storage(self, tmp_path):
-        """Create temporary file storage for testing."""
-        db_path = tmp_path / "test.db"
-        return Storage(str(db_path))
-
     def test_create_delivery_event_for_message(self, storage):
         """Test creating a delivery event for a message."""
         event_id = storage.create_delivery_event(
@@ -336,24 +379,19 @@ class TestDeliveryEventOperations:
             callback_response="OK",
         )
 
-        with storage._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM delivery_events WHERE id = ?", (event_id,))
-            event = dict(cursor.fetchone())
+        sent, response = _fetchone(
+            storage,
+            "SELECT callback_sent, callback_response FROM delivery_events WHERE id = ?",
+            (event_id,),
+        )
 
-        assert event["callback_sent"] == 1
-        assert event["callback_response"] == "OK"
+        assert sent == 1
+        assert response == "OK"
 
 
 class TestCallbackLogOperations:
     """Tests for callback log operations."""
 
-    @pytest.fixture
-    def storage(self, tmp_path):
-        """Create temporary file storage for testing."""
-        db_path = tmp_path / "test.db"
-        return Storage(str(db_path))
-
     def test_create_callback_log(self, storage):
         """Test creating a callback log."""
         log_id = storage.create_callback_log(
@@ -392,8 +430,12 @@ class TestCallbackLogOperations:
 
     def test_get_all_callback_logs_with_pagination(self, storage):
         """Test getting callback logs with pagination."""
-        for i in range(10):
-            storage.create_callback_log(f"http://example.com/{i}", '{"data": "test"}')
+        _bulk_insert(
+            storage,
+            "callback_logs",
+            _CALLBACK_LOG_COLUMNS,
+            [(f"http://example.com/{i}", '{"data": "test"}') for i in range(10)],
+        )
 
         logs = storage.get_all_callback_logs(limit=5, offset=3)
         assert len(logs) == 5
@@ -402,12 +444,6 @@ class TestCallbackLogOperations:
 class TestStatistics:
     """Tests for statistics operations."""
 
-    @pytest.fixture
-    def storage(self, tmp_path):
-        """Create temporary file storage for testing."""
-        db_path = tmp_path / "test.db"
-        return Storage(str(db_path))
-
     def test_get_statistics_empty_database(self, storage):
         """Test getting statistics from empty database."""
         stats = storage.get_statistics()
@@ -417,12 +453,22 @@ class TestStatistics:
 
     def test_get_statistics_with_data(self, storage):
         """Test getting statistics with data."""
-        storage.create_message("SM1", "twilio", "+1", "+2", "Test", "sent")
-        storage.create_message("SM2", "twilio", "+1", "+2", "Test", "sent")
-        storage.create_call("CA1", "twilio", "+1", "+2", "completed")
-        storage.create_callback_log("http://example.com", '{"data": "test"}')
-        storage.create_callback_log("http://example.com", '{"data": "test"}')
-        storage.create_callback_log("http://example.com", '{"data": "test"}')
+        _bulk_insert(
+            storage,
+            "messages",
+            _MESSAGE_COLUMNS,
+            [
+                ("SM1", "twilio", "+1", "+2", "Test", "sent"),
+                ("SM2", "twilio", "+1", "+2", "Test", "sent"),
+            ],
+        )
+        _bulk_insert(storage, "calls", _CALL_COLUMNS, [("CA1", "twilio", "+1", "+2", "completed")])
+        _bulk_insert(
+            storage,
+            "callback_logs",
+            _CALLBACK_LOG_COLUMNS,
+            [("http://example.com", '{"data": "test"}')] * 3,
+        )
 
         stats = storage.get_statistics()
         assert stats["messages"] == 2
@@ -433,12 +479,6 @@ class TestStatistics:
 class TestClearOperations:
     """Tests for clear/reset operations."""
 
-    @pytest.fixture
-    def storage(self, tmp_path):
-        """Create temporary file storage for testing."""
-        db_path = tmp_path / "test.db"
-        return Storage(str(db_path))
-
     def test_clear_messages(self, storage):
         """Test clearing messages."""
         storage.create_message("SM1", "twilio", "+1", "+2", "Test", "sent")
@@ -451,14 +491,8 @@ class TestClearOperations:
         messages = storage.get_all_messages()
         assert len(messages) == 0
 
-        with storage._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT COUNT(*) as count FROM delivery_events WHERE message_sid IS NOT NULL"
-            )
-            event_count = cursor.fetchone()["count"]
-
-        assert event_count == 0
+        query = "SELECT COUNT(*) FROM delivery_events WHERE message_sid IS NOT NULL"
+        assert _fetchone(storage, query)[0] == 0
 
     def test_clear_calls(self, storage):
         """Test clearing calls."""
@@ -472,14 +506,8 @@ class TestClearOperations:
         calls = storage.get_all_calls()
         assert len(calls) == 0
 
-        with storage._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT COUNT(*) as count FROM delivery_events WHERE call_sid IS NOT NULL"
-            )
-            event_count = cursor.fetchone()["count"]
-
-        assert event_count == 0
+        query = "SELECT COUNT(*) FROM delivery_events WHERE call_sid IS NOT NULL"
+        assert _fetchone(storage, query)[0] == 0
 
     def test_clear_callbacks(self, storage):
         """Test clearing callback logs."""
@@ -495,13 +523,28 @@ class TestClearOperations:
 
     def test_clear_all(self, storage):
         """Test clearing all data."""
-        storage.create_message("SM1", "twilio", "+1", "+2", "Test", "sent")
-        storage.create_message("SM2", "twilio", "+1", "+2", "Test", "sent")
-        storage.create_call("CA1", "twilio", "+1", "+2", "completed")
-        storage.create_callback_log("http://example.com", '{"data": "test"}')
-        storage.create_callback_log("http://example.com", '{"data": "test"}')
-        storage.create_delivery_event("SM1", None, "delivered", "success")
-        storage.create_delivery_event(None, "CA1", "answered", "success")
+        _bulk_insert(
+            storage,
+            "messages",
+            _MESSAGE_COLUMNS,
+            [
+                ("SM1", "twilio", "+1", "+2", "Test", "sent"),
+                ("SM2", "twilio", "+1", "+2", "Test", "sent"),
+            ],
+        )
+        _bulk_insert(storage, "calls", _CALL_COLUMNS, [("CA1", "twilio", "+1", "+2", "completed")])
+        _bulk_insert(
+            storage,
+            "callback_logs",
+            _CALLBACK_LOG_COLUMNS,
+            [("http://example.com", '{"data": "test"}')] * 2,
+        )
+        _bulk_insert(
+            storage,
+            "delivery_events",
+            ("message_sid", "call_sid", "event_type", "status"),
+            [("SM1", None, "delivered", "success"), (None, "CA1", "answered", "success")],
+        )
 
         result = storage.clear_all()
 
@@ -513,9 +556,49 @@ class TestClearOperations:
         assert len(storage.get_all_calls()) == 0
         assert len(storage.get_all_callback_logs()) == 0
 
-        with storage._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) as count FROM delivery_events")
-            event_count = cursor.fetchone()["count"]
+        assert _fetchone(storage, "SELECT COUNT(*) FROM delivery_events")[0] == 0
+
+
+class TestWriteListeners:
+    """Tests for write listener notifications."""
+
+    @pytest.fixture
+    def storage(self):
+        """Create a private storage so registered listeners do not leak."""
+        storage = Storage(":memory:")
+        yield storage
+        storage.close()
+
+    def test_listener_called_on_write(self, storage):
+        """Test that listeners are notified after each write."""
+        calls = []
+        storage.add_write_listener(lambda: calls.append(True))
+
+        storage.create_message("SM1", "twilio", "+1", "+2", "Test", "queued")
+        storage.update_message_status("SM1", "sent")
+        storage.clear_messages()
+
+        assert len(calls) == 3
+
+    def test_listener_registered_once(self, storage):
+        """Test that registering the same listener twice notifies it once."""
+        calls = []
+
+        def listener():
+            calls.append(True)
+
+        storage.add_write_listener(listener)
+        storage.add_write_listener(listener)
+        storage.create_message("SM1", "twilio", "+1", "+2", "Test", "queued")
+
+        assert len(calls) == 1
+
+    def test_listener_not_called_on_read(self, storage):
+        """Test that read operations do not notify listeners."""
+        calls = []
+        storage.add_write_listener(lambda: calls.append(True))
+
+        storage.get_all_messages()
+        storage.get_statistics()
 
-        assert event_count == 0
+        assert calls == []
@@ -1,51 +1,196 @@
 """Tests for template engine module."""
 
 import json
+import os
+import re
+import statistics
 import string
+from datetime import UTC, datetime
+from types import MappingProxyType
 
 import pytest
-from freezegun import freeze_time
+from jinja2 import DictLoader
 
+from app import template_engine
 from app.template_engine import TemplateEngine
 
+pytestmark = pytest.mark.unit
+
+_SID_BODY_RE = re.compile(r"[a-z0-9]{32}")
+
+# SID characters mapped to their alphabet index, and the mean popcount of
+# those indices when every character is equally likely
+_SID_ALPHABET = string.ascii_lowercase + string.digits
+_SID_INDEX = {char: index for index, char in enumerate(_SID_ALPHABET)}
+_SID_EXPECTED_POPCOUNT = statistics.mean(index.bit_count() for index in _SID_INDEX.values())
+
+# Read-only request payloads shared by the create_*_context tests
+_REQ_SMS = MappingProxyType({"From": "+1234567890", "To": "+0987654321", "Body": "Hello"})
+_REQ_CALL = MappingProxyType(
+    {"From": "+1234567890", "To": "+0987654321", "Url": "http://example.com/twiml"}
+)
+
+# Hand-written JSON; test_templates_are_valid_json guards the syntax
+_MESSAGE_TEMPLATE = (
+    '{"sid": "{{ message_sid }}", "account_sid": "{{ account_sid }}", '
+    '"from": "{{ request.From }}", "to": "{{ request.To }}", "body": "{{ request.Body }}", '
+    '"status": "{{ status }}", "num_segments": "{{ num_segments }}", '
+    '"date_created": "{{ date_created }}", "date_updated": "{{ date_updated }}"}'
+)
+_ERROR_TEMPLATE = '{"code": "{{ code }}", "message": "{{ message }}", "status": "{{ status }}"}'
+
+# frozen_time's moment as rendered by get_timestamp()
+_FROZEN_RFC2822 = "Mon, 15 Jan 2024 10:30:00 +0000"
+
+# Long messages, built once at import
+_ASCII_160 = "a" * 160
+_ASCII_161 = "a" * 161
+_ASCII_200 = "a" * 200
+_ASCII_306 = "a" * 306
+_ASCII_307 = "a" * 307
+_UNI_70 = "世" * 70
+_UNI_71 = "世" * 71
+_UNI_134 = "世" * 134
+_UNI_135 = "世" * 135
+
+# (message, expected segments)
+_SEGMENT_CASES = [
+    ("", 1),
+    ("Hello World!", 1),
+    (_ASCII_160, 1),
+    (_ASCII_161, 2),
+    (_ASCII_306, 2),
+    (_ASCII_307, 3),
+    ("Hello 世界", 1),
+    (_UNI_70, 1),
+    (_UNI_71, 2),
+    (_UNI_134, 2),
+    (_UNI_135, 3),
+]
+_SEGMENT_IDS = [
+    "empty",
+    "ascii_short",
+    "ascii_max",
+    "ascii_multi",
+    "ascii_exact_fit",
+    "ascii_three",
+    "unicode_short",
+    "unicode_max",
+    "unicode_multi",
+    "unicode_exact_fit",
+    "unicode_three",
+]
+
+
+def _frozen_datetime(moment):
+    """Build a datetime stand-in whose now() always returns moment."""
+
+    class _FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return moment.astimezone(tz)
+
+    return _FrozenDatetime
+
+
+@pytest.fixture
+def freeze_now(monkeypatch):
+    """Return a function pinning the template engine's clock to a UTC moment."""
+
+    def _freeze(*args):
+        moment = datetime(*args, tzinfo=UTC)
+        monkeypatch.setattr(template_engine, "datetime", _frozen_datetime(moment))
+
+    return _freeze
+
+
+@pytest.fixture
+def frozen_time(freeze_now):
+    """Freeze the template engine's clock at 2024-01-15 10:30:00 UTC."""
+    freeze_now(2024, 1, 15, 10, 30, 0)
+
+
+def _make_engine(tmp_path, provider="twilio"):
+    """Create a TemplateEngine over an empty responses directory under tmp_path.
+
+    The errors directory is never created; Jinja only reads it when an error
+    template is rendered.
+    """
+    templates_path = tmp_path / "responses"
+    templates_path.mkdir(exist_ok=True)
+    return TemplateEngine(str(templates_path), provider=provider)
+
+
+@pytest.fixture(scope="session")
+def engine(tmp_path_factory):
+    """Create one TemplateEngine shared by tests that render no templates."""
+    return _make_engine(tmp_path_factory.mktemp("engine"))
+
+
+@pytest.fixture(scope="session")
+def engine_with_templates():
+    """Create one TemplateEngine serving the test templates from memory.
+
+    Both templates are rendered once here so Jinja has already compiled them.
+    """
+    loader = DictLoader(
+        {"twilio/message.json": _MESSAGE_TEMPLATE, "twilio/error.json": _ERROR_TEMPLATE}
+    )
+    engine = TemplateEngine("unused", loader=loader, auto_reload=False)
+    engine.render_response("message.json", {"request": {}})
+    engine.render_error("error.json", {})
+    return engine
+
 
 class TestTemplateEngineInitialization:
     """Tests for TemplateEngine initialization."""
 
     def test_init_with_default_provider(self, tmp_path):
         """Test TemplateEngine initialization with default provider."""
-        templates_path = tmp_path / "responses"
-        templates_path.mkdir()
-        errors_path = tmp_path / "errors"
-        errors_path.mkdir()
-
-        engine = TemplateEngine(str(templates_path))
+        engine = _make_engine(tmp_path)
         assert engine.provider == "twilio"
-        assert engine.templates_path == templates_path
+        assert engine.templates_path == tmp_path / "responses"
 
     def test_init_with_custom_provider(self, tmp_path):
         """Test TemplateEngine initialization with custom provider."""
-        templates_path = tmp_path / "responses"
-        templates_path.mkdir()
-        errors_path = tmp_path / "errors"
-        errors_path.mkdir()
-
-        engine = TemplateEngine(str(templates_path), provider="custom")
+        engine = _make_engine(tmp_path, provider="custom")
         assert engine.provider == "custom"
 
+    def test_init_with_loader(self):
+        """Test a custom loader serves both response and error templates."""
+        loader = DictLoader({})
+
+        engine = TemplateEngine("unused", loader=loader)
+
+        assert engine.response_env.loader is loader
+        assert engine.error_env.loader is loader
+
+    def test_init_without_bytecode_cache(self, monkeypatch):
+        """Test templates auto-reload and skip the bytecode cache by default."""
+        monkeypatch.delenv("JINJA_BYTECODE_CACHE", raising=False)
+
+        engine = TemplateEngine("unused", loader=DictLoader({}))
+
+        for env in (engine.response_env, engine.error_env):
+            assert env.auto_reload is True
+            assert env.bytecode_cache is None
+
+    def test_init_with_bytecode_cache_from_env(self, tmp_path, monkeypatch):
+        """Test JINJA_BYTECODE_CACHE enables a shared on-disk bytecode cache."""
+        cache_dir = tmp_path / "jinja"
+        monkeypatch.setenv("JINJA_BYTECODE_CACHE", str(cache_dir))
+
+        engine = TemplateEngine("unused", loader=DictLoader({}), auto_reload=False)
+
+        assert cache_dir.is_dir()
+        assert engine.response_env.bytecode_cache is engine.error_env.bytecode_cache
+        assert engine.response_env.bytecode_cache.directory == str(cache_dir)
+        assert engine.response_env.auto_reload is False
+
 
 class TestGenerateSid:
     """Tests for generate_sid method."""
 
-    @pytest.fixture
-    def engine(self, tmp_path):
-        """Create TemplateEngine for testing."""
-        templates_path = tmp_path / "responses"
-        templates_path.mkdir()
-        errors_path = tmp_path / "errors"
-        errors_path.mkdir()
-        return TemplateEngine(str(templates_path))
-
     def test_generate_sid_default_prefix(self, engine):
         """Test generating SID with default prefix."""
         sid = engine.generate_sid()
@@ -58,52 +203,70 @@ class TestGenerateSid:
         assert sid.startswith("CA")
         assert len(sid) == 34
 
+    @staticmethod
+    def _assert_unique_sids(engine, count):
+        """Generate count SIDs in a tight loop and assert none repeat."""
+        seen = set()
+        add = seen.add
+        generate = engine.generate_sid
+        for _ in range(count):
+            add(generate())
+        assert len(seen) == count
+        # Spot-check the character set on every 10th SID
+        assert all(_SID_BODY_RE.fullmatch(sid[2:]) for sid in list(seen)[::10])
+
     def test_generate_sid_uniqueness(self, engine):
         """Test that generate_sid creates unique SIDs."""
-        sids = {engine.generate_sid() for _ in range(100)}
-        assert len(sids) == 100
+        self._assert_unique_sids(engine, 100)
+
+    @pytest.mark.slow
+    def test_generate_sid_uniqueness_large(self, engine):
+        """Test that generate_sid stays unique over a larger sweep."""
+        self._assert_unique_sids(engine, 10_000)
+
+    def test_generate_sid_entropy(self, engine):
+        """Test SID characters are spread evenly over the alphabet.
+
+        Raw SID bytes are ASCII, so their bit density is not 0.5; instead the
+        mean popcount of each character's alphabet index must match the
+        uniform expectation. A stuck or heavily biased RNG drifts far off it.
+        """
+        index = _SID_INDEX
+        popcounts = [
+            index[char].bit_count() for _ in range(256) for char in engine.generate_sid()[2:]
+        ]
+        assert statistics.mean(popcounts) == pytest.approx(_SID_EXPECTED_POPCOUNT, abs=0.1)
 
     def test_generate_sid_valid_characters(self, engine):
         """Test that generated SID contains only valid characters."""
         sid = engine.generate_sid()
-        sid_body = sid[2:]
-        valid_chars = string.ascii_lowercase + string.digits
-        assert all(char in valid_chars for char in sid_body)
+        assert _SID_BODY_RE.fullmatch(sid[2:])
 
 
 class TestTimestampMethods:
     """Tests for timestamp generation methods."""
 
-    @pytest.fixture
-    def engine(self, tmp_path):
-        """Create TemplateEngine for testing."""
-        templates_path = tmp_path / "responses"
-        templates_path.mkdir()
-        errors_path = tmp_path / "errors"
-        errors_path.mkdir()
-        return TemplateEngine(str(templates_path))
-
-    @freeze_time("2024-01-15 10:30:00")
+    @pytest.mark.usefixtures("frozen_time")
     def test_get_timestamp(self, engine):
         """Test RFC 2822 timestamp generation."""
         timestamp = engine.get_timestamp()
         assert timestamp == "Mon, 15 Jan 2024 10:30:00 +0000"
 
-    @freeze_time("2024-12-25 23:59:59")
-    def test_get_timestamp_specific_date(self, engine):
+    def test_get_timestamp_specific_date(self, engine, freeze_now):
         """Test RFC 2822 timestamp for specific date."""
+        freeze_now(2024, 12, 25, 23, 59, 59)
         timestamp = engine.get_timestamp()
         assert timestamp == "Wed, 25 Dec 2024 23:59:59 +0000"
 
-    @freeze_time("2024-01-15 10:30:00")
+    @pytest.mark.usefixtures("frozen_time")
     def test_get_iso_timestamp(self, engine):
         """Test ISO 8601 timestamp generation."""
         timestamp = engine.get_iso_timestamp()
         assert timestamp == "2024-01-15T10:30:00Z"
 
-    @freeze_time("2024-12-25 23:59:59")
-    def test_get_iso_timestamp_specific_date(self, engine):
+    def test_get_iso_timestamp_specific_date(self, engine, freeze_now):
         """Test ISO 8601 timestamp for specific date."""
+        freeze_now(2024, 12, 25, 23, 59, 59)
         timestamp = engine.get_iso_timestamp()
         assert timestamp == "2024-12-25T23:59:59Z"
 
@@ -111,117 +274,44 @@ class TestTimestampMethods:
 class TestCalculateSmsSegments:
     """Tests for calculate_sms_segments static method."""
 
-    def test_empty_message(self):
-        """Test calculation for empty message."""
-        segments = TemplateEngine.calculate_sms_segments("")
-        assert segments == 1
-
-    def test_single_segment_ascii_short(self):
-        """Test single segment for short ASCII message."""
-        message = "Hello World!"
-        segments = TemplateEngine.calculate_sms_segments(message)
-        assert segments == 1
-
-    def test_single_segment_ascii_max(self):
-        """Test single segment for max length ASCII message (160 chars)."""
-        message = "a" * 160
-        segments = TemplateEngine.calculate_sms_segments(message)
-        assert segments == 1
-
-    def test_multi_segment_ascii(self):
-        """Test multiple segments for long ASCII message."""
-        message = "a" * 161
-        segments = TemplateEngine.calculate_sms_segments(message)
-        assert segments == 2
-
-    def test_multi_segment_ascii_exact_fit(self):
-        """Test multiple segments for ASCII message exactly 306 chars (2 segments)."""
-        message = "a" * 306
-        segments = TemplateEngine.calculate_sms_segments(message)
-        assert segments == 2
-
-    def test_multi_segment_ascii_three_segments(self):
-        """Test three segments for long ASCII message."""
-        message = "a" * 307
-        segments = TemplateEngine.calculate_sms_segments(message)
-        assert segments == 3
-
-    def test_single_segment_unicode_short(self):
-        """Test single segment for short Unicode message."""
-        message = "Hello 世界"
-        segments = TemplateEngine.calculate_sms_segments(message)
-        assert segments == 1
-
-    def test_single_segment_unicode_max(self):
-        """Test single segment for max length Unicode message (70 chars)."""
-        message = "世" * 70
-        segments = TemplateEngine.calculate_sms_segments(message)
-        assert segments == 1
-
-    def test_multi_segment_unicode(self):
-        """Test multiple segments for long Unicode message."""
-        message = "世" * 71
-        segments = TemplateEngine.calculate_sms_segments(message)
-        assert segments == 2
-
-    def test_multi_segment_unicode_exact_fit(self):
-        """Test multiple segments for Unicode message exactly 134 chars (2 segments)."""
-        message = "世" * 134
-        segments = TemplateEngine.calculate_sms_segments(message)
-        assert segments == 2
-
-    def test_multi_segment_unicode_three_segments(self):
-        """Test three segments for long Unicode message."""
-        message = "世" * 135
-        segments = TemplateEngine.calculate_sms_segments(message)
-        assert segments == 3
+    @pytest.mark.parametrize(("message", "expected"), _SEGMENT_CASES, ids=_SEGMENT_IDS)
+    def test_calculate_sms_segments(self, message, expected):
+        """Test GSM-7 (160/153) and UCS-2 (70/67) segment boundaries."""
+        assert TemplateEngine.calculate_sms_segments(message) == expected
 
 
+@pytest.mark.usefixtures("frozen_time")
 class TestRenderMethods:
     """Tests for template rendering methods."""
 
-    @pytest.fixture
-    def engine_with_templates(self, tmp_path):
-        """Create TemplateEngine with test templates."""
-        # Create response templates
-        responses_path = tmp_path / "responses" / "twilio"
-        responses_path.mkdir(parents=True)
-
-        message_template = responses_path / "message.json"
-        message_template.write_text(
-            json.dumps(
-                {
-                    "sid": "{{ message_sid }}",
-                    "account_sid": "{{ account_sid }}",
-                    "from": "{{ request.From }}",
-                    "to": "{{ request.To }}",
-                    "body": "{{ request.Body }}",
-                    "status": "{{ status }}",
-                    "num_segments": "{{ num_segments }}",
-                    "date_created": "{{ date_created }}",
-                    "date_updated": "{{ date_updated }}",
-                }
-            )
-        )
-
-        # Create error templates
-        errors_path = tmp_path / "errors" / "twilio"
-        errors_path.mkdir(parents=True)
-
-        error_template = errors_path / "error.json"
-        error_template.write_text(
-            json.dumps(
-                {
-                    "code": "{{ code }}",
-                    "message": "{{ message }}",
-                    "status": "{{ status }}",
-                }
-            )
-        )
-
-        return TemplateEngine(str(tmp_path / "responses"))
+    @pytest.mark.parametrize(
+        ("template", "keys"),
+        [
+            (
+                _MESSAGE_TEMPLATE,
+                [
+                    "sid",
+                    "account_sid",
+                    "from",
+                    "to",
+                    "body",
+                    "status",
+                    "num_segments",
+                    "date_created",
+                    "date_updated",
+                ],
+            ),
+            (_ERROR_TEMPLATE, ["code", "message", "status"]),
+        ],
+        ids=["message", "error"],
+    )
+    def test_templates_are_valid_json(self, template, keys):
+        """Test the hand-written templates parse with one placeholder per key."""
+        parsed = json.loads(template)
+
+        assert list(parsed) == keys
+        assert all(re.fullmatch(r"\{\{ [\w.]+ \}\}", value) for value in parsed.values())
 
-    @freeze_time("2024-01-15 10:30:00")
     def test_render_response(self, engine_with_templates):
         """Test rendering response template."""
         context = {
@@ -238,17 +328,18 @@ class TestRenderMethods:
 
         result = engine_with_templates.render_response("message.json", context)
 
-        assert result["sid"] == "SM123"
-        assert result["account_sid"] == "AC456"
-        assert result["from"] == "+1234567890"
-        assert result["to"] == "+0987654321"
-        assert result["body"] == "Test message"
-        assert result["status"] == "queued"
-        assert result["num_segments"] == "1"
-        assert result["date_created"] == "Mon, 15 Jan 2024 10:30:00 +0000"
-        assert result["date_updated"] == "Mon, 15 Jan 2024 10:30:00 +0000"
-
-    @freeze_time("2024-01-15 10:30:00")
+        assert result == {
+            "sid": "SM123",
+            "account_sid": "AC456",
+            "from": "+1234567890",
+            "to": "+0987654321",
+            "body": "Test message",
+            "status": "queued",
+            "num_segments": "1",
+            "date_created": _FROZEN_RFC2822,
+            "date_updated": _FROZEN_RFC2822,
+        }
+
     def test_render_error(self, engine_with_templates):
         """Test rendering error template."""
         context = {"code": 21211, "message": "Invalid phone number", "status": 400}
@@ -256,101 +347,93 @@ class TestRenderMethods:
         result = engine_with_templates.render_error("error.json", context)
 
         # JSON renders numbers as strings when using Jinja templates
-        assert result["code"] == "21211"
-        assert result["message"] == "Invalid phone number"
-        assert result["status"] == "400"
+        assert result == {"code": "21211", "message": "Invalid phone number", "status": "400"}
+
+    def test_get_compiled_memoizes_without_auto_reload(self, engine_with_templates):
+        """Test the compiled template is reused when auto_reload is off."""
+        template = engine_with_templates.get_compiled("message.json")
+
+        assert engine_with_templates.get_compiled("message.json") is template
+        assert json.loads(template.render(request={}, status="sent"))["status"] == "sent"
 
+    def test_get_compiled_picks_up_edits_with_auto_reload(self, tmp_path):
+        """Test edited templates are recompiled when auto_reload is on."""
+        engine = _make_engine(tmp_path)
+        template_file = tmp_path / "responses" / "twilio" / "message.json"
+        template_file.parent.mkdir()
+        template_file.write_text('{"version": "1"}')
+        assert engine.render_response("message.json", {}) == {"version": "1"}
 
+        template_file.write_text('{"version": "2"}')
+        # Bump the mtime explicitly; writes within one clock tick can share it
+        mtime = template_file.stat().st_mtime + 10
+        os.utime(template_file, (mtime, mtime))
+
+        assert engine.get_compiled("message.json").render() == '{"version": "2"}'
+        assert engine.render_response("message.json", {}) == {"version": "2"}
+
+
+@pytest.mark.usefixtures("frozen_time")
 class TestCreateMessageContext:
     """Tests for create_message_context method."""
 
-    @pytest.fixture
-    def engine(self, tmp_path):
-        """Create TemplateEngine for testing."""
-        templates_path = tmp_path / "responses"
-        templates_path.mkdir()
-        errors_path = tmp_path / "errors"
-        errors_path.mkdir()
-        return TemplateEngine(str(templates_path))
-
-    @freeze_time("2024-01-15 10:30:00")
     def test_create_message_context_basic(self, engine):
         """Test creating basic message context."""
-        request_data = {"From": "+1234567890", "To": "+0987654321", "Body": "Hello"}
-
         context = engine.create_message_context(
             message_sid="SM123",
             account_sid="AC456",
-            request_data=request_data,
+            request_data=_REQ_SMS,
             status="queued",
         )
 
-        assert context["message_sid"] == "SM123"
-        assert context["account_sid"] == "AC456"
-        assert context["request"] == request_data
-        assert context["status"] == "queued"
-        assert context["num_segments"] == 1
-        assert context["date_created"] == "Mon, 15 Jan 2024 10:30:00 +0000"
+        assert context == {
+            "message_sid": "SM123",
+            "account_sid": "AC456",
+            "request": _REQ_SMS,
+            "status": "queued",
+            "num_segments": 1,
+            "date_created": _FROZEN_RFC2822,
+            "date_updated": _FROZEN_RFC2822,
+        }
 
     def test_create_message_context_multi_segment(self, engine):
         """Test creating message context with multi-segment message."""
-        request_data = {"From": "+1234567890", "To": "+0987654321", "Body": "a" * 200}
-
         context = engine.create_message_context(
-            message_sid="SM123", account_sid="AC456", request_data=request_data
+            message_sid="SM123",
+            account_sid="AC456",
+            request_data={**_REQ_SMS, "Body": _ASCII_200},
         )
 
         assert context["num_segments"] == 2
 
 
+@pytest.mark.usefixtures("frozen_time")
 class TestCreateCallContext:
     """Tests for create_call_context method."""
 
-    @pytest.fixture
-    def engine(self, tmp_path):
-        """Create TemplateEngine for testing."""
-        templates_path = tmp_path / "responses"
-        templates_path.mkdir()
-        errors_path = tmp_path / "errors"
-        errors_path.mkdir()
-        return TemplateEngine(str(templates_path))
-
-    @freeze_time("2024-01-15 10:30:00")
     def test_create_call_context(self, engine):
         """Test creating call context."""
-        request_data = {
-            "From": "+1234567890",
-            "To": "+0987654321",
-            "Url": "http://example.com/twiml",
-        }
-
         context = engine.create_call_context(
             call_sid="CA123",
             account_sid="AC456",
-            request_data=request_data,
+            request_data=_REQ_CALL,
             status="queued",
         )
 
-        assert context["call_sid"] == "CA123"
-        assert context["account_sid"] == "AC456"
-        assert context["request"] == request_data
-        assert context["status"] == "queued"
-        assert context["date_created"] == "Mon, 15 Jan 2024 10:30:00 +0000"
+        assert context == {
+            "call_sid": "CA123",
+            "account_sid": "AC456",
+            "request": _REQ_CALL,
+            "status": "queued",
+            "date_created": _FROZEN_RFC2822,
+            "date_updated": _FROZEN_RFC2822,
+        }
 
 
+@pytest.mark.usefixtures("frozen_time")
 class TestCreateDeliveryStatusContext:
     """Tests for create_delivery_status_context method."""
 
-    @pytest.fixture
-    def engine(self, tmp_path):
-        """Create TemplateEngine for testing."""
-        templates_path = tmp_path / "responses"
-        templates_path.mkdir()
-        errors_path = tmp_path / "errors"
-        errors_path.mkdir()
-        return TemplateEngine(str(templates_path))
-
-    @freeze_time("2024-01-15 10:30:00")
     def test_create_delivery_status_context(self, engine):
         """Test creating delivery status context."""
         context = engine.create_delivery_status_context(
@@ -361,9 +444,11 @@ class TestCreateDeliveryStatusContext:
             status="delivered",
         )
 
-        assert context["MessageSid"] == "SM123"
-        assert context["AccountSid"] == "AC456"
-        assert context["From"] == "+1234567890"
-        assert context["To"] == "+0987654321"
-        assert context["MessageStatus"] == "delivered"
-        assert context["timestamp"] == "2024-01-15T10:30:00Z"
+        assert context == {
+            "MessageSid": "SM123",
+            "AccountSid": "AC456",
+            "From": "+1234567890",
+            "To": "+0987654321",
+            "MessageStatus": "delivered",
+            "timestamp": "2024-01-15T10:30:00Z",
+        }
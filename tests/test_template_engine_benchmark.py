@@ -0,0 +1,24 @@
+"""Benchmarks for TemplateEngine hot paths.
+
+Benchmarks are disabled in normal test runs; use ``make bench`` to time them
+and compare against the last saved run.
+"""
+
+import pytest
+
+from app.template_engine import TemplateEngine
+
+pytestmark = pytest.mark.benchmark(group="template_engine")
+
+_SEGMENT_MESSAGES = {
+    "ascii_single": "a" * 160,
+    "ascii_multi": "a" * 307,
+    "unicode_single": "世" * 70,
+    "unicode_multi": "世" * 135,
+}
+
+
+@pytest.mark.parametrize("message", _SEGMENT_MESSAGES.values(), ids=_SEGMENT_MESSAGES.keys())
+def test_bench_calculate_sms_segments(benchmark, message):
+    """Benchmark segment counting for single and multi-part messages."""
+    assert benchmark(TemplateEngine.calculate_sms_segments, message) >= 1
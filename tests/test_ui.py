@@ -0,0 +1,208 @@
+"""Tests for the rendered page cache in app/ui.py."""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi.responses import HTMLResponse
+
+from app import ui
+from app.storage import Storage
+from app.ui import HtmlCache, cached_page
+
+pytestmark = pytest.mark.unit
+
+_KEY = ("/ui/messages", 1)
+_OTHER_KEY = ("/ui/messages", 2)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Pin the cache's monotonic clock; advance it by setting clock.now."""
+    fake = SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr(ui, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def cache():
+    """Create an empty cache with a 5 second TTL and room for two pages."""
+    return HtmlCache(ttl_seconds=5, max_entries=2)
+
+
+@pytest.fixture
+def shared_cache():
+    """Empty the module-level cache used by cached_page around each test."""
+    ui.html_cache.clear()
+    yield ui.html_cache
+    ui.html_cache.clear()
+
+
+@pytest.fixture
+def storage(shared_cache):
+    """Create a private storage that clears the shared cache on writes."""
+    storage = Storage(":memory:")
+    storage.add_write_listener(shared_cache.clear)
+    yield storage
+    storage.close()
+
+
+def _request(path="/ui/messages"):
+    """Build the minimal request object cached_page reads."""
+    return SimpleNamespace(url=SimpleNamespace(path=path))
+
+
+class TestHtmlCache:
+    """Tests for HtmlCache get/put/clear."""
+
+    def test_get_missing_returns_none(self, cache):
+        """Test an unknown key is a miss."""
+        assert cache.get(_KEY) is None
+
+    def test_put_then_get(self, cache):
+        """Test a stored body is returned as bytes."""
+        cache.put(_KEY, memoryview(b"<p>page</p>"), cache.generation)
+
+        assert cache.get(_KEY) == b"<p>page</p>"
+
+    def test_entry_expires_after_ttl(self, cache, clock):
+        """Test entries are served until the TTL passes, then dropped."""
+        cache.put(_KEY, b"body", cache.generation)
+
+        clock.now += 5
+        assert cache.get(_KEY) == b"body"
+
+        clock.now += 0.001
+        assert cache.get(_KEY) is None
+        assert _KEY not in cache._entries
+
+    def test_full_cache_is_emptied_before_insert(self, cache):
+        """Test reaching max_entries drops old pages to make room."""
+        cache.put(_KEY, b"one", cache.generation)
+        cache.put(_OTHER_KEY, b"two", cache.generation)
+
+        cache.put(("/ui/calls", 1), b"three", cache.generation)
+
+        assert cache.get(_KEY) is None
+        assert cache.get(_OTHER_KEY) is None
+        assert cache.get(("/ui/calls", 1)) == b"three"
+
+    def test_clear_drops_entries_and_bumps_generation(self, cache):
+        """Test clear() empties the cache and starts a new generation."""
+        cache.put(_KEY, b"body", cache.generation)
+        generation = cache.generation
+
+        cache.clear()
+
+        assert cache.get(_KEY) is None
+        assert cache.generation == generation + 1
+
+    def test_put_from_stale_generation_is_dropped(self, cache):
+        """Test a page rendered before a clear() is never stored."""
+        generation = cache.generation
+        cache.clear()
+
+        cache.put(_KEY, b"stale", generation)
+
+        assert cache.get(_KEY) is None
+
+
+class TestCachedPage:
+    """Tests for the cached_page route decorator."""
+
+    async def test_second_request_served_from_cache(self, shared_cache):
+        """Test the handler runs once and later requests reuse its body."""
+        calls = []
+
+        @cached_page
+        async def handler(request, page):
+            calls.append(page)
+            return HTMLResponse(content=f"page {page}")
+
+        first = await handler(_request(), 1)
+        second = await handler(_request(), 1)
+
+        assert calls == [1]
+        assert first.body == second.body == b"page 1"
+
+    async def test_pages_cached_separately(self, shared_cache):
+        """Test each (path, page) pair gets its own entry."""
+
+        @cached_page
+        async def handler(request, page):
+            return HTMLResponse(content=f"page {page}")
+
+        await handler(_request(), 1)
+        await handler(_request(), 2)
+
+        assert shared_cache.get(("/ui/messages", 1)) == b"page 1"
+        assert shared_cache.get(("/ui/messages", 2)) == b"page 2"
+
+    async def test_storage_write_invalidates_cached_page(self, storage, shared_cache):
+        """Test a storage write drops pages cached before it."""
+
+        @cached_page
+        async def handler(request, page):
+            return HTMLResponse(content="before")
+
+        await handler(_request(), 1)
+        storage.create_message("SM1", "twilio", "+1", "+2", "Test", "queued")
+
+        assert shared_cache.get(_KEY) is None
+
+    async def test_write_during_render_is_not_cached(self, storage, shared_cache):
+        """Test a page rendered across a storage write is served but not stored."""
+
+        @cached_page
+        async def handler(request, page):
+            # Data changes after this render read it but before the put
+            storage.create_message("SM1", "twilio", "+1", "+2", "Test", "queued")
+            return HTMLResponse(content="stale")
+
+        response = await handler(_request(), 1)
+
+        assert response.body == b"stale"
+        assert shared_cache.get(_KEY) is None
+
+
+async def _skip_callbacks(**kwargs):
+    """Stand-in for CallbackHandler.process_message_callbacks."""
+
+
+@pytest.fixture
+def main(tmp_path, monkeypatch, shared_cache):
+    """Point the app module at a private database with status callbacks off."""
+    from app import main
+
+    monkeypatch.setattr(main.storage, "db_path", tmp_path / "ui.db")
+    main.storage._init_database()
+    monkeypatch.setattr(main.callback_handler, "process_message_callbacks", _skip_callbacks)
+    return main
+
+
+@pytest.fixture
+def client(main):
+    """Serve the real app."""
+    from fastapi.testclient import TestClient
+
+    with TestClient(main.app) as client:
+        yield client
+
+
+class TestCachedRoutes:
+    """Tests for the cached list pages served through the app."""
+
+    def test_api_write_evicts_cached_list_page(self, main, client):
+        """Test a message sent through the API shows up on a cached list page."""
+        twilio = main.config.twilio
+
+        assert client.get("/ui/messages").status_code == 200
+        response = client.post(
+            f"/2010-04-01/Accounts/{twilio.account_sid}/Messages.json",
+            data={"From": "+15550000001", "To": "+15551234567", "Body": "cache test"},
+            auth=(twilio.account_sid, twilio.auth_token),
+        )
+        assert response.status_code == 201
+        message_sid = response.json()["sid"]
+
+        assert message_sid in client.get("/ui/messages").text